@@ -0,0 +1,99 @@
+"""Import time of the TrashDay integration modules.
+
+Every module is imported in a fresh interpreter that has already imported
+the parts of Home Assistant loaded before any custom integration, so only
+the integration's own cost is measured. Third-party packages pulled in by
+the import are listed, which shows when a heavy dependency (bs4) is loaded
+eagerly again:
+
+    python benchmarks/bench_import.py --repeat 5
+
+Requires Home Assistant and the integration's dependencies.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+MODULES = [
+    "custom_components.trash_day",
+    "custom_components.trash_day.sensor",
+    "custom_components.trash_day.calendar",
+    "custom_components.trash_day.config_flow",
+    "custom_components.trash_day.diagnostics",
+]
+
+# Loaded by Home Assistant itself before it sets up the integration
+PRELOADED = [
+    "homeassistant.config_entries",
+    "homeassistant.helpers.aiohttp_client",
+    "homeassistant.helpers.config_validation",
+    "homeassistant.helpers.entity_platform",
+    "homeassistant.helpers.event",
+    "homeassistant.helpers.storage",
+    "homeassistant.helpers.template",
+    "homeassistant.helpers.update_coordinator",
+    "homeassistant.components.sensor",
+    "homeassistant.components.calendar",
+]
+
+_PROBE = """
+import importlib, json, sys, time
+for name in {preloaded!r}:
+    importlib.import_module(name)
+before = set(sys.modules)
+started = time.perf_counter()
+importlib.import_module({module!r})
+elapsed = time.perf_counter() - started
+new = sorted({{
+    name.split(".")[0] for name in set(sys.modules) - before
+}} - {{"custom_components", "homeassistant"}})
+print(json.dumps({{"seconds": elapsed, "packages": new}}))
+"""
+
+
+def measure(module: str) -> dict:
+    """Return the import time of module and the top-level packages it loaded."""
+    output = subprocess.run(
+        [sys.executable, "-c", _PROBE.format(preloaded=PRELOADED, module=module)],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main() -> int:
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5, help="fresh interpreters per module")
+    parser.add_argument("--save", help="write results to this JSON file")
+    args = parser.parse_args()
+
+    results = {}
+    print(f"{'module':42} {'min ms':>8} {'mean ms':>8}  packages loaded")
+    for module in MODULES:
+        runs = [measure(module) for _ in range(args.repeat)]
+        timings = [run["seconds"] * 1000 for run in runs]
+        results[module] = {
+            "min_ms": min(timings),
+            "mean_ms": sum(timings) / len(timings),
+            "packages": runs[0]["packages"],
+        }
+        print(
+            f"{module:42} {results[module]['min_ms']:8.1f} {results[module]['mean_ms']:8.1f}  "
+            f"{', '.join(results[module]['packages']) or '-'}"
+        )
+
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as out:
+            json.dump(results, out, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,191 @@
+"""Offline benchmarks of the TrashDay scrape-parse-group pipeline.
+
+Times every stage separately on recorded pages and reports the peak memory
+allocated by each stage (tracemalloc). Results can be saved as JSON and
+compared against a previous run to catch regressions before a release:
+
+    python benchmarks/bench_pipeline.py --save baseline.json
+    python benchmarks/bench_pipeline.py --baseline baseline.json
+
+Requires the integration's dependencies (Home Assistant, beautifulsoup4).
+"""
+import argparse
+import json
+import os
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+from types import MethodType, SimpleNamespace
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import fixtures  # noqa: E402
+
+from homeassistant.util import dt as dt_util  # noqa: E402
+
+from custom_components.trash_day.const import PARSERS, WASTE_TYPES  # noqa: E402
+from custom_components.trash_day.coordinator import WasteCollectionCoordinator  # noqa: E402
+from custom_components.trash_day.parser import (  # noqa: E402
+    parse_municipalities,
+    parse_schedule,
+    parse_streets,
+)
+from custom_components.trash_day.schedule import ScheduleIndex  # noqa: E402
+from custom_components.trash_day.sensor import (  # noqa: E402
+    NextWasteCollectionSensor,
+    WasteTypeSensor,
+)
+
+SCHEDULE_FIXTURES = [
+    "schedule_small.html",
+    "schedule_year.html",
+    "schedule_multi_year.html",
+]
+
+# A day covered by every schedule fixture, so that sensors build their full
+# attributes instead of the empty ones of a schedule in the past
+BENCH_NOW = datetime(2025, 1, 10, 12, 0)
+
+
+def measure(func, repeat: int):
+    """Return (mean seconds, min seconds, peak bytes) of calling func."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return sum(timings) / len(timings), min(timings), peak
+
+
+def _bench_coordinator(index: ScheduleIndex):
+    """Return the minimal coordinator state that sensors and _build_data read."""
+    coordinator = SimpleNamespace(
+        municipality_id="1",
+        streets=["Długa"],
+        last_update_success=True,
+        _data_versions={},
+        _last_indexes={},
+        _type_versions={},
+        _diff_types=WasteCollectionCoordinator._diff_types,
+        # Only the built-in waste types, learned ones need a Store
+        hub=SimpleNamespace(
+            registry=SimpleNamespace(waste_ids=lambda: list(WASTE_TYPES), info=WASTE_TYPES.get)
+        ),
+        data=None,
+    )
+    coordinator.street_data = MethodType(WasteCollectionCoordinator.street_data, coordinator)
+    coordinator.waste_type_info = MethodType(WasteCollectionCoordinator.waste_type_info, coordinator)
+    coordinator.data = {
+        "Długa": WasteCollectionCoordinator._build_data(
+            coordinator, "Długa", index, "2025-01-01 00:00:00"
+        )
+    }
+    return coordinator
+
+
+def _sensor_attributes(coordinator) -> None:
+    entry = SimpleNamespace(
+        data={"municipality_id": "1", "street": "Długa"}, options={}
+    )
+    sensors = [NextWasteCollectionSensor(coordinator, entry, "Długa")] + [
+        WasteTypeSensor(coordinator, entry, "Długa", waste_id, info["name"], info["icon"], info["color"])
+        for waste_id, info in WASTE_TYPES.items()
+    ]
+    for sensor in sensors:
+        sensor._build_attributes()
+
+
+def run(repeat: int, parsers):
+    """Run all benchmarks and return {name: result}."""
+    real_now = dt_util.now
+    dt_util.now = lambda time_zone=None: BENCH_NOW.replace(
+        tzinfo=time_zone or dt_util.DEFAULT_TIME_ZONE
+    )
+    try:
+        return _run(repeat, parsers)
+    finally:
+        dt_util.now = real_now
+
+
+def _run(repeat: int, parsers):
+    cases = {
+        "parse_municipalities": lambda html=fixtures.load("municipalities.html"): parse_municipalities(html),
+        "parse_streets": lambda html=fixtures.load("streets.html"): parse_streets(html),
+    }
+
+    for name in SCHEDULE_FIXTURES:
+        html = fixtures.load(name)
+        label = name.replace(".html", "")
+        for parser in parsers:
+            cases[f"parse[{parser}] {label}"] = lambda html=html, parser=parser: parse_schedule(html, parser)
+
+        dates, _ = parse_schedule(html, parsers[0])
+        cases[f"group {label}"] = lambda dates=dates: _bench_coordinator(ScheduleIndex(dates))
+
+        coordinator = _bench_coordinator(ScheduleIndex(dates))
+        cases[f"attributes {label}"] = lambda coordinator=coordinator: _sensor_attributes(coordinator)
+
+        index = coordinator.data["Długa"]["index"]
+        days = [BENCH_NOW.date() + timedelta(days=n) for n in range(365)]
+        cases[f"next lookups x365 {label}"] = lambda index=index, days=days: [
+            index.next_per_type(day) for day in days
+        ]
+
+    results = {}
+    for name, func in cases.items():
+        mean, best, peak = measure(func, repeat)
+        results[name] = {"mean_ms": mean * 1000, "min_ms": best * 1000, "peak_kib": peak / 1024}
+    return results
+
+
+def main() -> int:
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=20, help="timed runs per case")
+    parser.add_argument("--parser", action="append", choices=PARSERS, help="parser backends to compare (default: all)")
+    parser.add_argument("--save", help="write results to this JSON file")
+    parser.add_argument("--baseline", help="compare against results saved with --save")
+    parser.add_argument("--threshold", type=float, default=20.0, help="allowed slowdown in percent")
+    args = parser.parse_args()
+
+    results = run(args.repeat, args.parser or PARSERS)
+    baseline = {}
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as baseline_file:
+            baseline = json.load(baseline_file)
+
+    regressions = 0
+    print(f"{'case':48} {'mean ms':>10} {'min ms':>10} {'peak KiB':>10} {'vs base':>9}")
+    for name, result in results.items():
+        change = ""
+        if name in baseline:
+            delta = (result["min_ms"] / baseline[name]["min_ms"] - 1) * 100
+            change = f"{delta:+.0f}%"
+            if delta > args.threshold:
+                change += " !"
+                regressions += 1
+        print(
+            f"{name:48} {result['mean_ms']:10.3f} {result['min_ms']:10.3f} "
+            f"{result['peak_kib']:10.1f} {change:>9}"
+        )
+
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as out:
+            json.dump(results, out, indent=2)
+
+    if regressions:
+        print(f"{regressions} case(s) slower than baseline by more than {args.threshold}%")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
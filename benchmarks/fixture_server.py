@@ -0,0 +1,195 @@
+"""Local stand-in for the fxsystems schedule service.
+
+Serves recorded municipality, street and schedule pages at the same path and
+query parameters as HarmonogramOnline.dll, with injectable latency and
+failures, so the integration can be exercised and load tested offline:
+
+    python benchmarks/fixture_server.py --port 8080 --latency 0.2 --error-rate 0.05
+
+and in configuration.yaml:
+
+    trash_day:
+      base_url: http://127.0.0.1:8080/OdbiorySmieci/HarmonogramOnline.dll
+
+Pages are read from --pages (municipalities.html, streets.html, schedule.html)
+and fall back to the benchmark fixtures; the fallback schedule covers the
+current year so the sensors have upcoming dates. Schedule pages carry an
+ETag and answer conditional requests with 304.
+
+Requires aiohttp (installed with Home Assistant).
+"""
+import argparse
+import asyncio
+import hashlib
+import os
+import random
+import sys
+from collections import Counter
+from datetime import date
+from typing import Dict, Optional
+
+from aiohttp import web
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import fixtures  # noqa: E402
+
+SERVICE_PATH = "/OdbiorySmieci/HarmonogramOnline.dll"
+
+
+def _load_pages(pages_dir: Optional[str]) -> Dict[str, str]:
+    """Return the pages to serve by kind."""
+    pages = {
+        "municipalities": fixtures.load("municipalities.html"),
+        "streets": fixtures.load("streets.html"),
+        "schedule": fixtures.schedule_html(date(date.today().year, 1, 1), 365),
+    }
+    if pages_dir:
+        for kind in pages:
+            path = os.path.join(pages_dir, f"{kind}.html")
+            if os.path.exists(path):
+                with open(path, encoding="utf-8") as page:
+                    pages[kind] = page.read()
+    return pages
+
+
+class FixtureServer:
+    """HTTP server replaying schedule service pages.
+
+    Latency and failure settings are plain attributes and may be changed
+    while the server runs, e.g. to start an outage in the middle of a test.
+    """
+
+    def __init__(
+        self,
+        pages_dir: Optional[str] = None,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        error_status: int = 503,
+        drop_rate: float = 0.0,
+        seed: Optional[int] = None,
+    ):
+        """Initialize."""
+        self.pages = _load_pages(pages_dir)
+        self.etags = {
+            kind: '"' + hashlib.sha1(page.encode()).hexdigest() + '"'
+            for kind, page in self.pages.items()
+        }
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.drop_rate = drop_rate
+        self.requests: Counter = Counter()
+        self.errors = 0
+        self.dropped = 0
+        self.not_modified = 0
+        self._random = random.Random(seed)
+        self._runner: Optional[web.AppRunner] = None
+
+    @property
+    def total_requests(self) -> int:
+        """Return the number of requests received."""
+        return sum(self.requests.values())
+
+    async def _handle(self, request: web.Request) -> web.StreamResponse:
+        if "ulica" in request.query:
+            kind = "schedule"
+        elif "gmina_id" in request.query:
+            kind = "streets"
+        else:
+            kind = "municipalities"
+        self.requests[kind] += 1
+
+        delay = self.latency + self._random.uniform(0, self.jitter)
+        if delay:
+            await asyncio.sleep(delay)
+
+        roll = self._random.random()
+        if roll < self.drop_rate:
+            # Close the connection without an answer
+            self.dropped += 1
+            request.transport.close()
+            return web.Response()
+        if roll < self.drop_rate + self.error_rate:
+            self.errors += 1
+            return web.Response(status=self.error_status, text="Injected error")
+
+        etag = self.etags[kind]
+        if kind == "schedule" and request.headers.get("If-None-Match") == etag:
+            self.not_modified += 1
+            return web.Response(status=304, headers={"ETag": etag})
+        return web.Response(
+            text=self.pages[kind],
+            content_type="text/html",
+            headers={"ETag": etag} if kind == "schedule" else None,
+        )
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        """Start serving and return the base URL of the service."""
+        app = web.Application()
+        app.router.add_get(SERVICE_PATH, self._handle)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        return f"http://{host}:{port}{SERVICE_PATH}"
+
+    async def stop(self) -> None:
+        """Stop serving."""
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+
+async def _serve(args: argparse.Namespace) -> None:
+    server = FixtureServer(
+        pages_dir=args.pages,
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        error_status=args.error_status,
+        drop_rate=args.drop_rate,
+        seed=args.seed,
+    )
+    base_url = await server.start(args.host, args.port)
+    print(f"Serving schedule pages at {base_url}", flush=True)
+    try:
+        while True:
+            await asyncio.sleep(args.stats_interval)
+            print(
+                f"requests: {dict(server.requests)} errors: {server.errors} "
+                f"dropped: {server.dropped} not modified: {server.not_modified}",
+                flush=True,
+            )
+    finally:
+        await server.stop()
+
+
+def main() -> None:
+    """Run the fixture server until interrupted."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--pages", help="directory with recorded pages")
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds per response")
+    parser.add_argument("--jitter", type=float, default=0.0, help="random extra seconds")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="share of error responses")
+    parser.add_argument("--error-status", type=int, default=503)
+    parser.add_argument(
+        "--drop-rate", type=float, default=0.0, help="share of connections closed unanswered"
+    )
+    parser.add_argument("--seed", type=int, help="seed of the failure injection")
+    parser.add_argument("--stats-interval", type=float, default=60.0)
+    args = parser.parse_args()
+
+    try:
+        asyncio.run(_serve(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
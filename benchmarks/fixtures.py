@@ -0,0 +1,112 @@
+"""Synthetic fxsystems pages for the TrashDay benchmarks.
+
+The markup mirrors the pages served by HarmonogramOnline.dll. Run this file
+to regenerate the saved fixtures in benchmarks/fixtures/.
+"""
+import os
+import random
+from datetime import date, timedelta
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+WASTE_TYPES = [
+    ("biodegradowalne", "#9F703B", 14),
+    ("zmieszane", "#596D81", 14),
+    ("metale i tworzywa sztuczne", "#F9C625", 14),
+    ("papier i tektura", "#11ADE4", 28),
+    ("szkło", "#7EC451", 28),
+    ("popiół", "#626262", 14),
+]
+WEEKDAYS = ["poniedziałek", "wtorek", "środa", "czwartek", "piątek", "sobota", "niedziela"]
+PROVINCES = ["mazowieckie", "małopolskie", "łódzkie", "śląskie", "świętokrzyskie", "lubelskie"]
+STREET_WORDS = ["Długa", "Krótka", "Żwirowa", "Leśna", "Łąkowa", "Polna", "Ogrodowa", "Słoneczna", "Kościelna", "Źródlana"]
+
+_PAGE = """<!DOCTYPE html>
+<html lang="pl">
+<head><meta charset="utf-8"><title>Harmonogram odbioru odpadów</title></head>
+<body>
+<div class="container">
+{body}
+</div>
+</body>
+</html>
+"""
+
+_CARD = """<div class="termin card">
+  <div class="bok" style="background-color:{color};"></div>
+  <div class="naglowek">{day} ({weekday})</div>
+  <div class="srodek">
+    <h3>{name}</h3>
+    <p class="opis">Prosimy o wystawienie pojemników do godziny 6:00.</p>
+  </div>
+</div>"""
+
+
+def schedule_html(start: date, days: int) -> str:
+    """Return a schedule page with collections over ``days`` days from ``start``."""
+    cards = []
+    for offset in range(days):
+        day = start + timedelta(days=offset)
+        for pos, (name, color, period) in enumerate(WASTE_TYPES):
+            if (offset + pos * 3) % period == 0:
+                cards.append(
+                    _CARD.format(
+                        color=color,
+                        day=day.isoformat(),
+                        weekday=WEEKDAYS[day.weekday()],
+                        name=name,
+                    )
+                )
+    body = "<h4>Harmonogram odbioru odpadów dla gminy: Testowo</h4>\n" + "\n".join(cards)
+    return _PAGE.format(body=body)
+
+
+def municipalities_html(count: int) -> str:
+    """Return the start page with ``count`` municipalities to choose from."""
+    rng = random.Random(count)
+    options = ['<option value="">-- wybierz gminę --</option>']
+    for num in range(1, count + 1):
+        province = rng.choice(PROVINCES)
+        options.append(
+            f'<option value="{num}">woj.: {province} powiat: Powiat {num % 97} '
+            f"gmina: Gmina Żółkiewka-{num}</option>"
+        )
+    body = '<select id="selGmina">\n' + "\n".join(options) + "\n</select>"
+    return _PAGE.format(body=body)
+
+
+def streets_html(count: int) -> str:
+    """Return a municipality page with ``count`` streets to choose from."""
+    options = ["<option hidden disabled selected>-- wybierz ulicę --</option>"]
+    for num in range(count):
+        word = STREET_WORDS[num % len(STREET_WORDS)]
+        options.append(f"<option>{word} {num // len(STREET_WORDS) + 1}</option>")
+    body = (
+        "<h4>Harmonogram odbioru odpadów dla gminy: Testowo</h4>\n"
+        '<select id="selUlica">\n' + "\n".join(options) + "\n</select>"
+    )
+    return _PAGE.format(body=body)
+
+
+SAVED_FIXTURES = {
+    "schedule_small.html": lambda: schedule_html(date(2025, 1, 1), 31),
+    "schedule_year.html": lambda: schedule_html(date(2025, 1, 1), 365),
+    "municipalities.html": lambda: municipalities_html(2500),
+    "streets.html": lambda: streets_html(1000),
+}
+
+
+def load(name: str) -> str:
+    """Return a saved fixture, or a generated multi-year schedule."""
+    if name == "schedule_multi_year.html":
+        return schedule_html(date(2021, 1, 1), 5 * 365)
+    with open(os.path.join(FIXTURES_DIR, name), encoding="utf-8") as fixture:
+        return fixture.read()
+
+
+if __name__ == "__main__":
+    os.makedirs(FIXTURES_DIR, exist_ok=True)
+    for file_name, build in SAVED_FIXTURES.items():
+        with open(os.path.join(FIXTURES_DIR, file_name), "w", encoding="utf-8") as out:
+            out.write(build())
+        print("wrote", file_name)
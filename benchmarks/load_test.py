@@ -0,0 +1,286 @@
+"""Load test of many TrashDay coordinators sharing one event loop.
+
+Starts the fixture server in a separate process, creates --entries
+coordinators with all their sensors in a bare Home Assistant instance and
+drives them through a first refresh, --cycles background refreshes and
+--rollovers simulated midnights. Every phase reports event loop lag
+percentiles, process CPU per coordinator refresh and the number of state
+writes, followed by the peak RSS of the run:
+
+    python benchmarks/load_test.py --entries 500 --latency 0.2 --jitter 0.3
+
+The request limits default to values far above the integration's own so
+that the integration, not the rate limiter, is measured; pass
+--max-concurrent 2 --requests-per-minute 20 to see real refresh times.
+
+Requires Home Assistant. Linux only (peak RSS is read from getrusage).
+"""
+import argparse
+import asyncio
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import timedelta
+from types import SimpleNamespace
+from typing import Dict, List, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import fixtures  # noqa: E402
+
+from homeassistant.core import CoreState, HomeAssistant  # noqa: E402
+from homeassistant import loader  # noqa: E402
+from homeassistant.const import EVENT_STATE_CHANGED  # noqa: E402
+from homeassistant.helpers import area_registry, device_registry, entity, entity_registry  # noqa: E402
+from homeassistant.helpers.entity_component import EntityComponent  # noqa: E402
+from homeassistant.util import dt as dt_util  # noqa: E402
+
+from custom_components.trash_day import sensor  # noqa: E402
+from custom_components.trash_day.const import DOMAIN, DATA_BASE_URL, PARSERS  # noqa: E402
+from custom_components.trash_day.coordinator import WasteCollectionCoordinator  # noqa: E402
+from custom_components.trash_day.fetch import async_get_fetcher  # noqa: E402
+
+LAG_INTERVAL = 0.01
+
+
+class LagSampler:
+    """Records how late the event loop runs a short repeating timer."""
+
+    def __init__(self, loop: asyncio.AbstractEventLoop):
+        """Initialize."""
+        self._loop = loop
+        self._expected = 0.0
+        self._handle = None
+        self.samples: List[float] = []
+
+    def start(self) -> None:
+        """Start sampling."""
+        self._expected = self._loop.time() + LAG_INTERVAL
+        self._handle = self._loop.call_at(self._expected, self._sample)
+
+    def stop(self) -> None:
+        """Stop sampling."""
+        if self._handle is not None:
+            self._handle.cancel()
+
+    def _sample(self) -> None:
+        now = self._loop.time()
+        self.samples.append(now - self._expected)
+        self._expected = now + LAG_INTERVAL
+        self._handle = self._loop.call_at(self._expected, self._sample)
+
+
+def percentile(values: List[float], share: float) -> float:
+    """Return the value below which the given share of values falls."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(share * len(ordered)))]
+
+
+def _current_rss_mib() -> float:
+    with open("/proc/self/status", encoding="ascii") as status:
+        for line in status:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) / 1024
+    return 0.0
+
+
+def _start_fixture_server(args: argparse.Namespace) -> Tuple[subprocess.Popen, str]:
+    """Start the fixture server process and return it with its base URL."""
+    command = [
+        sys.executable,
+        os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixture_server.py"),
+        "--port", "0",
+        "--latency", str(args.latency),
+        "--jitter", str(args.jitter),
+        "--error-rate", str(args.error_rate),
+        "--stats-interval", "3600",
+    ]
+    if args.seed is not None:
+        command += ["--seed", str(args.seed)]
+    server = subprocess.Popen(command, stdout=subprocess.PIPE, text=True)
+    line = server.stdout.readline()
+    if not line:
+        raise RuntimeError("Fixture server did not start")
+    return server, line.rsplit(" ", 1)[-1].strip()
+
+
+async def _async_create_hass(config_dir: str) -> HomeAssistant:
+    """Return a Home Assistant instance with only the registries loaded."""
+    hass = HomeAssistant(config_dir)
+    hass.config.set_time_zone("Europe/Warsaw")
+    hass.config.skip_pip = True
+    entity.async_setup(hass)
+    loader.async_setup(hass)
+    await asyncio.gather(
+        area_registry.async_load(hass),
+        device_registry.async_load(hass),
+        entity_registry.async_load(hass),
+    )
+    hass.set_state(CoreState.running)
+    return hass
+
+
+def _street_names(count: int) -> List[str]:
+    words = fixtures.STREET_WORDS
+    return [f"{words[num % len(words)]} {num // len(words) + 1}" for num in range(count)]
+
+
+async def _async_create_entries(hass: HomeAssistant, args: argparse.Namespace):
+    """Create the coordinators and sensors of every simulated entry."""
+    component = EntityComponent(sensor._LOGGER, "sensor", hass)
+    streets = _street_names(args.streets)
+    coordinators = []
+    entities = []
+    for num in range(args.entries):
+        municipality_id = str(num % args.municipalities + 1)
+        entry = SimpleNamespace(
+            entry_id=f"load_{num}",
+            data={"municipality_id": municipality_id, "municipality_name": "Testowo"},
+            options={},
+            # Listeners of the sensor platform live until Home Assistant stops
+            async_on_unload=lambda unsubscribe: None,
+        )
+        coordinator = WasteCollectionCoordinator(
+            hass,
+            municipality_id,
+            # Entries of the same municipality watch different streets
+            [f"{street} {num}" for street in streets],
+            timedelta(hours=12),
+            parser=args.parser,
+        )
+        hass.data[DOMAIN][entry.entry_id] = coordinator
+        coordinators.append(coordinator)
+        await sensor.async_setup_entry(hass, entry, entities.extend)
+
+    await component.async_add_entities(entities)
+    return coordinators, len(entities)
+
+
+async def _async_run(args: argparse.Namespace, base_url: str) -> Dict[str, Dict[str, float]]:
+    config_dir = tempfile.mkdtemp(prefix="trash_day_load_")
+    hass = await _async_create_hass(config_dir)
+    hass.data.setdefault(DOMAIN, {})[DATA_BASE_URL] = base_url
+    async_get_fetcher(hass).scheduler.configure(args.max_concurrent, args.requests_per_minute)
+
+    state_writes = 0
+
+    def _count_write(event) -> None:
+        nonlocal state_writes
+        state_writes += 1
+
+    hass.bus.async_listen(EVENT_STATE_CHANGED, _count_write)
+
+    rss_before = _current_rss_mib()
+    coordinators, entity_count = await _async_create_entries(hass, args)
+    print(
+        f"{len(coordinators)} entries, {sum(len(c.streets) for c in coordinators)} streets, "
+        f"{entity_count} entities, RSS {rss_before:.0f} -> {_current_rss_mib():.0f} MiB"
+    )
+
+    sampler = LagSampler(hass.loop)
+    sampler.start()
+    results = {}
+
+    async def phase(name: str, refreshes: int, action) -> None:
+        nonlocal state_writes
+        first_sample = len(sampler.samples)
+        state_writes = 0
+        wall = time.perf_counter()
+        cpu = time.process_time()
+        await action()
+        await hass.async_block_till_done()
+        cpu = time.process_time() - cpu
+        wall = time.perf_counter() - wall
+        lags = sampler.samples[first_sample:]
+        results[name] = {
+            "wall_s": wall,
+            "cpu_ms_per_refresh": cpu * 1000 / refreshes,
+            "state_writes": state_writes,
+            "lag_p50_ms": percentile(lags, 0.50) * 1000,
+            "lag_p95_ms": percentile(lags, 0.95) * 1000,
+            "lag_p99_ms": percentile(lags, 0.99) * 1000,
+            "lag_max_ms": max(lags, default=0.0) * 1000,
+        }
+
+    async def refresh_all() -> None:
+        await asyncio.gather(*(c.async_refresh() for c in coordinators))
+
+    await phase("first refresh", len(coordinators), refresh_all)
+    for cycle in range(args.cycles):
+        await phase(f"refresh {cycle + 1}", len(coordinators), refresh_all)
+
+    # Midnights are simulated by moving the integration's clock forward
+    real_now = dt_util.now
+    try:
+        for day in range(1, args.rollovers + 1):
+            offset = timedelta(days=day)
+            dt_util.now = lambda time_zone=None, offset=offset: real_now(time_zone) + offset
+
+            async def rollover() -> None:
+                now = dt_util.now()
+                for coordinator in coordinators:
+                    coordinator._async_rollover(now)
+
+            await phase(f"rollover {day}", len(coordinators), rollover)
+    finally:
+        dt_util.now = real_now
+
+    sampler.stop()
+    failures = sum(c.failed_fetches for c in coordinators)
+    print(f"failed fetches: {failures}, peak RSS {resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024:.0f} MiB")
+
+    await hass.async_stop(force=True)
+    return results
+
+
+def main() -> int:
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--entries", type=int, default=100, help="config entries to simulate")
+    parser.add_argument("--streets", type=int, default=1, help="streets per entry")
+    parser.add_argument("--municipalities", type=int, default=20, help="municipalities the entries are spread over")
+    parser.add_argument("--cycles", type=int, default=3, help="refresh cycles after the first refresh")
+    parser.add_argument("--rollovers", type=int, default=3, help="simulated midnights")
+    parser.add_argument("--parser", choices=PARSERS, default=PARSERS[0])
+    parser.add_argument("--latency", type=float, default=0.05, help="fixture server latency in seconds")
+    parser.add_argument("--jitter", type=float, default=0.05, help="fixture server random extra latency")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="share of failed responses")
+    parser.add_argument("--seed", type=int, help="seed of the failure injection")
+    parser.add_argument("--max-concurrent", type=int, default=32, help="requests in flight per host")
+    parser.add_argument("--requests-per-minute", type=int, default=60000, help="request rate per host")
+    parser.add_argument("--save", help="write results to this JSON file")
+    args = parser.parse_args()
+
+    server, base_url = _start_fixture_server(args)
+    try:
+        results = asyncio.run(_async_run(args, base_url))
+    finally:
+        server.terminate()
+        server.wait()
+
+    print(
+        f"{'phase':16} {'wall s':>8} {'cpu ms/refresh':>15} {'writes':>8} "
+        f"{'lag p50':>8} {'p95':>8} {'p99':>8} {'max':>8}"
+    )
+    for name, result in results.items():
+        print(
+            f"{name:16} {result['wall_s']:8.2f} {result['cpu_ms_per_refresh']:15.2f} "
+            f"{result['state_writes']:8} {result['lag_p50_ms']:8.1f} {result['lag_p95_ms']:8.1f} "
+            f"{result['lag_p99_ms']:8.1f} {result['lag_max_ms']:8.1f}"
+        )
+
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as out:
+            json.dump(results, out, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
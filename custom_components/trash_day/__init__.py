@@ -2,57 +2,203 @@
 import asyncio
 import logging
 import os
+import random
 from datetime import timedelta
+from typing import Optional
+
+import voluptuous as vol
 
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant, callback
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+    callback,
+)
+import homeassistant.helpers.config_validation as cv
 from homeassistant.helpers.typing import ConfigType
+from homeassistant.util import dt as dt_util
 from homeassistant.exceptions import ConfigEntryNotReady
 from homeassistant.const import Platform
 from homeassistant.helpers import template
 
 from .const import (
     DOMAIN,
+    DATA_BASE_URL,
+    CONF_BASE_URL,
     CONF_MUNICIPALITY_ID,
     CONF_MUNICIPALITY_NAME,
     CONF_STREET,
+    CONF_STREETS,
     CONF_SCAN_INTERVAL,
+    CONF_PARSER,
+    CONF_ADAPTIVE_POLLING,
     DEFAULT_SCAN_INTERVAL,
+    DEFAULT_PARSER,
+    DEFAULT_ADAPTIVE_POLLING,
+    STARTUP_STAGGER,
+    SERVICE_GET_SCHEDULE,
+    ATTR_CONFIG_ENTRY_ID,
+    ATTR_STREET,
+    ATTR_WASTE_ID,
+    ATTR_START,
+    ATTR_END,
 )
-from .coordinator import WasteCollectionCoordinator
+from .classifier import WasteTypeRegistry
+from .coordinator import WasteCollectionCoordinator, async_release_hub
+from .executor import async_configure_parsing, async_start_watchdog
+from .fetch import async_configure_limits
+from .store import ScheduleStore
 
 _LOGGER = logging.getLogger(__name__)
 
-PLATFORMS = [Platform.SENSOR]
+PLATFORMS = [Platform.SENSOR, Platform.CALENDAR]
+
+# Entries are set up in the UI, YAML only points the integration at
+# another schedule service, e.g. the fixture server in benchmarks/
+CONFIG_SCHEMA = vol.Schema(
+    {DOMAIN: vol.Schema({vol.Optional(CONF_BASE_URL): cv.url})},
+    extra=vol.ALLOW_EXTRA,
+)
+
+GET_SCHEDULE_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_CONFIG_ENTRY_ID): cv.string,
+        vol.Optional(ATTR_STREET): cv.string,
+        vol.Optional(ATTR_WASTE_ID): cv.string,
+        vol.Optional(ATTR_START): cv.date,
+        vol.Optional(ATTR_END): cv.date,
+    }
+)
 
 
 async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
     """Set up the TrashDay component."""
-    hass.data.setdefault(DOMAIN, {})
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    base_url = config.get(DOMAIN, {}).get(CONF_BASE_URL)
+    if base_url:
+        _LOGGER.warning("Using schedule service at %s", base_url)
+        domain_data[DATA_BASE_URL] = base_url.rstrip("/")
+
+    async def get_schedule(call: ServiceCall) -> ServiceResponse:
+        """Return the full schedule of one or all configured streets."""
+        entry_id = call.data.get(ATTR_CONFIG_ENTRY_ID)
+        street_filter = call.data.get(ATTR_STREET)
+        waste_id = call.data.get(ATTR_WASTE_ID)
+        start = call.data.get(ATTR_START)
+        end = call.data.get(ATTR_END)
+        today = dt_util.now().date()
+
+        response = {}
+        for coordinator_entry_id, coordinator in hass.data[DOMAIN].items():
+            if not isinstance(coordinator, WasteCollectionCoordinator):
+                continue
+            if entry_id and coordinator_entry_id != entry_id:
+                continue
+
+            streets = {}
+            for street in coordinator.streets:
+                data = coordinator.street_data(street)
+                if data is None or (street_filter and street != street_filter):
+                    continue
+
+                collections = []
+                for d in data["index"].dates:
+                    if waste_id and d.waste_id != waste_id:
+                        continue
+                    if start and d.date_obj < start:
+                        continue
+                    if end and d.date_obj > end:
+                        continue
+                    collections.append({
+                        "date": d.date,
+                        "weekday": d.weekday,
+                        "waste_type": d.waste_type,
+                        "waste_id": d.waste_id,
+                        "days_until": (d.date_obj - today).days,
+                    })
+
+                streets[street] = {
+                    "retrieval_date": data["retrieval_date"],
+                    "collections": collections,
+                }
+
+            if not streets:
+                continue
+            if len(coordinator.streets) == 1:
+                # Single-street entries keep a flat response
+                street, street_response = next(iter(streets.items()))
+                response[coordinator_entry_id] = {
+                    "municipality_id": coordinator.municipality_id,
+                    "street": street,
+                    **street_response,
+                }
+            else:
+                response[coordinator_entry_id] = {
+                    "municipality_id": coordinator.municipality_id,
+                    "streets": streets,
+                }
+
+        return response
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_GET_SCHEDULE,
+        get_schedule,
+        schema=GET_SCHEDULE_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+
     return True
 
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up TrashDay from a config entry."""
+    coordinator = None
     try:
         municipality_id = entry.data[CONF_MUNICIPALITY_ID]
-        street = entry.data[CONF_STREET]
+        # Multi-street entries list their streets, others have a single one
+        street = entry.data.get(CONF_STREET)
+        streets = entry.data.get(CONF_STREETS) or [street]
         municipality_name = entry.data.get(CONF_MUNICIPALITY_NAME, "Unknown Municipality")
 
         # Oblicz interwał aktualizacji
         scan_interval_minutes = entry.options.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL.total_seconds() / 60)
         update_interval = timedelta(minutes=scan_interval_minutes)
 
+        # Request limits and parsing mode are shared, pick up changes from this entry's options
+        async_configure_limits(hass)
+        async_configure_parsing(hass)
+        async_start_watchdog(hass)
+
         # Utwórz koordynatora
         coordinator = WasteCollectionCoordinator(
             hass,
             municipality_id=municipality_id,
-            street=street,
+            streets=streets,
             update_interval=update_interval,
+            parser=entry.options.get(CONF_PARSER, DEFAULT_PARSER),
+            adaptive_polling=entry.options.get(
+                CONF_ADAPTIVE_POLLING, DEFAULT_ADAPTIVE_POLLING
+            ),
         )
 
-        # Fetch initial data
-        await coordinator.async_config_entry_first_refresh()
+        if await coordinator.async_load_cached():
+            # Serve the cached schedule now and revalidate it in the background
+            # Spread revalidations so that a restart does not hit the
+            # service with every entry at once
+            delay = 0.0
+            if not hass.is_running:
+                delay = random.uniform(0, STARTUP_STAGGER.total_seconds())
+            entry.async_create_background_task(
+                hass,
+                _async_refresh_later(coordinator, delay),
+                f"{DOMAIN}_revalidate_{entry.entry_id}",
+            )
+        else:
+            # Fetch initial data
+            await coordinator.async_config_entry_first_refresh()
 
         # Sprawdź dane, nawet puste dane są OK, ale błąd nie
         if coordinator.last_update_success is False:
@@ -63,16 +209,23 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         # Setup platforms
         await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
 
+        # Keep days until collection current between polls; started only
+        # now, so a failed platform setup leaves no timer behind
+        entry.async_on_unload(coordinator.async_start_rollover())
+
         # Setup options update listener
         entry.async_on_unload(entry.add_update_listener(update_options))
 
         # Utwórz funkcję serwisową do tworzenia szablonów
-        @callback
-        def install_template_sensors(call):
+        async def install_template_sensors(call):
             """Install template sensors for TrashDay."""
             try:
                 force = call.data.get("force", False)
                 _LOGGER.info("Installing TrashDay template sensors (force=%s)", force)
+                _LOGGER.warning(
+                    "install_template_sensors is deprecated, the integration now "
+                    "provides native days text sensors for every street"
+                )
 
                 # Przygotuj nazwę ulicy bezpieczną dla nazwy pliku
                 safe_street = street.lower().replace(' ', '_').replace('-', '_')
@@ -175,15 +328,13 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         {{% endif %}}
 """.format(street=safe_street)
 
-                # Check if file exists and we don't want to force overwrite
-                if os.path.exists(template_path) and not force:
+                # File I/O runs in the executor, not on the event loop
+                if not await hass.async_add_executor_job(
+                    _write_template_file, template_path, template_content, force
+                ):
                     _LOGGER.info("Template file already exists: %s", template_path)
                     return
 
-                # Write the file
-                with open(template_path, "w", encoding="utf-8") as f:
-                    f.write(template_content)
-
                 # Create notification for user
                 hass.components.persistent_notification.async_create(
                     f"Template sensors for TrashDay have been created for street {street}. "
@@ -198,17 +349,56 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
             except Exception as e:
                 _LOGGER.error("Error creating templates: %s", e, exc_info=True)
 
-        # Rejestracja serwisu
-        hass.services.async_register(
-            DOMAIN, 'install_template_sensors', install_template_sensors
-        )
+        # Rejestracja serwisu (szablony są generowane dla pojedynczej ulicy)
+        if street is not None:
+            hass.services.async_register(
+                DOMAIN, 'install_template_sensors', install_template_sensors
+            )
 
         return True
+    except ConfigEntryNotReady:
+        _async_abandon_setup(hass, entry, coordinator)
+        # Let Home Assistant retry the setup later
+        raise
     except Exception as e:
+        _async_abandon_setup(hass, entry, coordinator)
         _LOGGER.error("Error setting up TrashDay: %s", e, exc_info=True)
         return False
 
 
+@callback
+def _async_abandon_setup(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    coordinator: Optional[WasteCollectionCoordinator],
+) -> None:
+    """Drop what a failed setup registered, so the shared hub can be released."""
+    if coordinator is None:
+        return
+    hass.data[DOMAIN].pop(entry.entry_id, None)
+    async_release_hub(hass, coordinator.hub)
+
+
+def _write_template_file(path: str, content: str, force: bool) -> bool:
+    """Write a template file unless it exists; return True if written."""
+    # Check if file exists and we don't want to force overwrite
+    if os.path.exists(path) and not force:
+        return False
+
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(content)
+    return True
+
+
+async def _async_refresh_later(
+    coordinator: WasteCollectionCoordinator, delay: float
+) -> None:
+    """Refresh the coordinator after a delay."""
+    if delay:
+        await asyncio.sleep(delay)
+    await coordinator.async_refresh()
+
+
 async def update_options(hass: HomeAssistant, entry: ConfigEntry) -> None:
     """Update options for existing entry."""
     await hass.config_entries.async_reload(entry.entry_id)
@@ -218,6 +408,31 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
     unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
     if unload_ok:
-        hass.data[DOMAIN].pop(entry.entry_id)
-
-    return unload_ok
\ No newline at end of file
+        coordinator = hass.data[DOMAIN].pop(entry.entry_id)
+        async_release_hub(hass, coordinator.hub)
+
+    return unload_ok
+
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove the cached schedules of a deleted entry."""
+    municipality_id = entry.data[CONF_MUNICIPALITY_ID]
+    others = [
+        other
+        for other in hass.config_entries.async_entries(DOMAIN)
+        if other.entry_id != entry.entry_id
+        and other.data.get(CONF_MUNICIPALITY_ID) == municipality_id
+    ]
+    # A street's schedule is shared by the entries watching it, the learned
+    # waste types by every entry of the municipality
+    streets_in_use = {
+        street
+        for other in others
+        for street in other.data.get(CONF_STREETS) or [other.data.get(CONF_STREET)]
+    }
+    for street in entry.data.get(CONF_STREETS) or [entry.data[CONF_STREET]]:
+        if street not in streets_in_use:
+            await ScheduleStore(hass, municipality_id, street).async_remove()
+
+    if not others:
+        await WasteTypeRegistry(hass, municipality_id).async_remove()
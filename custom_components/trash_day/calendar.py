@@ -0,0 +1,88 @@
+"""Calendar platform for TrashDay integration."""
+import logging
+from datetime import datetime, time, timedelta
+from typing import List, Optional
+
+from homeassistant.components.calendar import CalendarEntity, CalendarEvent
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN
+from .coordinator import WasteCollectionCoordinator
+from .entity import WasteCollectionEntity
+
+_LOGGER = logging.getLogger(__name__)
+
+
+async def async_setup_entry(
+    hass: HomeAssistant, entry: ConfigEntry, async_add_entities: AddEntitiesCallback
+) -> None:
+    """Set up the waste collection calendar."""
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+    async_add_entities(
+        [WasteCollectionCalendar(coordinator, entry, street) for street in coordinator.streets]
+    )
+
+
+class WasteCollectionCalendar(WasteCollectionEntity, CalendarEntity):
+    """Calendar with an all-day event for every collection."""
+
+    def __init__(
+        self,
+        coordinator: WasteCollectionCoordinator,
+        config_entry: ConfigEntry,
+        street: str,
+    ):
+        """Initialize the calendar."""
+        super().__init__(coordinator, config_entry, street)
+        self._attr_name = f"Waste Collection {self.street}"
+        self._attr_unique_id = f"{self.municipality_id}_{self.street}_calendar"
+        self._attr_icon = "mdi:calendar-clock"
+        self._events_version = None
+        self._events: List[CalendarEvent] = []
+
+    def _all_events(self) -> List[CalendarEvent]:
+        """Return events aligned with the index dates, built once per schedule."""
+        if self._events_version != self._data_version:
+            index = self._index
+            self._events = [] if index is None else [
+                CalendarEvent(
+                    start=d.date_obj,
+                    end=d.date_obj + timedelta(days=1),
+                    summary=(self.coordinator.waste_type_info(d.waste_id) or {}).get("name_pl")
+                    or d.waste_type,
+                    uid=f"{self.municipality_id}_{self.street}_{d.waste_id}_{d.date}",
+                )
+                for d in index.dates
+            ]
+            self._events_version = self._data_version
+        return self._events
+
+    @property
+    def event(self) -> Optional[CalendarEvent]:
+        """Return the next upcoming or current event."""
+        index = self._index
+        if index is None:
+            return None
+        today = dt_util.now().date()
+        pos = index.span(today, today).start
+        if pos < len(index.dates):
+            return self._all_events()[pos]
+        return None
+
+    async def async_get_events(
+        self, hass: HomeAssistant, start_date: datetime, end_date: datetime
+    ) -> List[CalendarEvent]:
+        """Return collections overlapping the requested range."""
+        index = self._index
+        if index is None:
+            return []
+
+        start = dt_util.as_local(start_date)
+        end = dt_util.as_local(end_date)
+        # An all-day event on the end day overlaps only if the range ends after midnight
+        end_day = end.date() + timedelta(days=1) if end.time() != time.min else end.date()
+
+        return self._all_events()[index.span(start.date(), end_day)]
@@ -0,0 +1,127 @@
+"""Waste type classification for TrashDay integration."""
+import asyncio
+import logging
+from typing import Any, Dict, List, Optional
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util, slugify
+
+from .const import DOMAIN, STORAGE_VERSION, WASTE_TYPES, LEARNED_TYPE_ICON
+from .parser import resolve_waste_id, waste_type_key
+from .schedule import Collection
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class WasteTypeRegistry:
+    """Waste types of a municipality, including those learned from its pages.
+
+    A card is classified by its title, then by its color (resolve_waste_id).
+    A card matching neither gets a new type named after its title. Learned
+    types are kept on disk, so their IDs and sensors survive a restart and
+    cached schedules can be classified without fetching them again.
+    """
+
+    def __init__(self, hass: HomeAssistant, municipality_id: str):
+        """Initialize."""
+        self.municipality_id = municipality_id
+        self._store = Store(
+            hass, STORAGE_VERSION, f"{DOMAIN}.waste_types_{municipality_id}"
+        )
+        self._lock = asyncio.Lock()
+        self._loaded = False
+        # Learned waste ID -> name, color and the day it was first seen
+        self.types: Dict[str, Dict[str, str]] = {}
+        # Folded title -> learned waste ID
+        self._ids: Dict[str, str] = {}
+
+    async def async_load(self) -> None:
+        """Load the learned types once."""
+        async with self._lock:
+            if self._loaded:
+                return
+            try:
+                stored = await self._store.async_load()
+            except Exception as e:
+                _LOGGER.warning("Could not load learned waste types: %s", e)
+                stored = None
+            self._loaded = True
+
+            for waste_id, info in (stored or {}).get("types", {}).items():
+                self.types[waste_id] = info
+                self._ids[waste_type_key(info["name"])] = waste_id
+
+    @callback
+    def _data_to_save(self) -> Dict[str, Any]:
+        return {"types": self.types}
+
+    @callback
+    def async_classify(self, dates: List[Collection]) -> List[Collection]:
+        """Return the dates with every unrecognized card assigned a waste type.
+
+        The list is returned as is when all cards were recognized.
+        """
+        if all(c.waste_id for c in dates):
+            return dates
+        return [
+            c
+            if c.waste_id
+            else Collection.create(
+                c.date_obj, c.weekday, c.waste_type, self._classify(c), c.color
+            )
+            for c in dates
+        ]
+
+    def _classify(self, collection: Collection) -> str:
+        waste_id = resolve_waste_id(collection.waste_type, collection.color)
+        if waste_id:
+            return waste_id
+
+        key = waste_type_key(collection.waste_type)
+        waste_id = self._ids.get(key)
+        if waste_id is None:
+            base_id = waste_id = slugify(key) or "unknown"
+            suffix = 1
+            while waste_id in self.types:
+                # Different titles with the same slug, e.g. "a/b" and "a b"
+                suffix += 1
+                waste_id = f"{base_id}_{suffix}"
+            self._ids[key] = waste_id
+            self.types[waste_id] = {
+                "name": collection.waste_type,
+                "color": collection.color,
+                "first_seen": dt_util.now().date().isoformat(),
+            }
+            _LOGGER.info(
+                "New waste type in municipality %s: %s (%s)",
+                self.municipality_id,
+                collection.waste_type,
+                waste_id,
+            )
+            self._store.async_delay_save(self._data_to_save)
+        return waste_id
+
+    @callback
+    def waste_ids(self) -> List[str]:
+        """Return the IDs of the built-in and learned waste types."""
+        return [*WASTE_TYPES, *self.types]
+
+    @callback
+    def info(self, waste_id: str) -> Optional[Dict[str, str]]:
+        """Return name, icon and color of a waste type, as in WASTE_TYPES."""
+        if waste_id in WASTE_TYPES:
+            return WASTE_TYPES[waste_id]
+        learned = self.types.get(waste_id)
+        if learned is None:
+            return None
+        return {
+            "name": learned["name"],
+            "name_pl": learned["name"],
+            "icon": LEARNED_TYPE_ICON,
+            "color": learned["color"],
+        }
+
+    async def async_remove(self) -> None:
+        """Remove the learned types from disk."""
+        await self._store.async_remove()
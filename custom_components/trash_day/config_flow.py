@@ -13,14 +13,31 @@ from .const import (
     CONF_MUNICIPALITY_ID,
     CONF_MUNICIPALITY_NAME,
     CONF_STREET,
+    CONF_STREETS,
+    CONF_SEARCH,
     CONF_SCAN_INTERVAL,
+    CONF_PARSER,
+    CONF_MAX_COLLECTIONS,
+    CONF_COLLECTIONS_WINDOW,
+    CONF_ADAPTIVE_POLLING,
+    CONF_MAX_CONCURRENT_REQUESTS,
+    CONF_REQUESTS_PER_MINUTE,
+    CONF_PARSE_IN_PROCESS,
     DEFAULT_SCAN_INTERVAL,
+    DEFAULT_PARSER,
+    DEFAULT_MAX_COLLECTIONS,
+    DEFAULT_COLLECTIONS_WINDOW,
+    DEFAULT_ADAPTIVE_POLLING,
+    DEFAULT_MAX_CONCURRENT_REQUESTS,
+    DEFAULT_REQUESTS_PER_MINUTE,
+    DEFAULT_PARSE_IN_PROCESS,
+    PARSERS,
     DEFAULT_NAME,
     SELECTOR_MUNICIPALITY,
     SELECTOR_STREET,
     OPTION_SCAN_INTERVAL,
 )
-from .coordinator import WasteCollectionCoordinator
+from .directory import async_get_directory
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -28,7 +45,7 @@ _LOGGER = logging.getLogger(__name__)
 async def _get_municipalities(hass: HomeAssistant):
     """Get list of municipalities."""
     try:
-        return await WasteCollectionCoordinator.get_municipalities(hass)
+        return await async_get_directory(hass).async_get_municipalities()
     except Exception as e:
         _LOGGER.error("Error getting municipalities: %s", e)
         return []
@@ -37,7 +54,7 @@ async def _get_municipalities(hass: HomeAssistant):
 async def _get_streets(hass: HomeAssistant, municipality_id: str):
     """Get list of streets for municipality."""
     try:
-        return await WasteCollectionCoordinator.get_streets(hass, municipality_id)
+        return await async_get_directory(hass).async_get_streets(municipality_id)
     except Exception as e:
         _LOGGER.error("Error getting streets: %s", e)
         return {"streets": [], "municipality_name": "Unknown"}
@@ -51,8 +68,12 @@ class WasteCollectionFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
     def __init__(self):
         """Initialize flow."""
         self._municipalities = []
+        self._municipality_options = None
         self._streets_data = {"streets": [], "municipality_name": ""}
+        self._street_options = None
         self._municipality_id = None
+        # Multi-street entry served by a single coordinator
+        self._batch = False
 
     async def async_step_user(self, user_input=None):
         """Handle the initial step."""
@@ -65,10 +86,45 @@ class WasteCollectionFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
             if not self._municipalities:
                 return self.async_abort(reason="no_municipalities")
 
-            return await self.async_step_municipality()
+            return self.async_show_menu(
+                step_id="user", menu_options=["municipality_search", "batch"]
+            )
 
         return await self.async_step_municipality(user_input)
 
+    async def async_step_batch(self, user_input=None):
+        """Start setting up an entry for many streets of one municipality."""
+        self._batch = True
+        return await self.async_step_municipality_search()
+
+    async def async_step_municipality_search(self, user_input=None):
+        """Narrow down the municipality list by a search phrase."""
+        errors = {}
+
+        if user_input is not None:
+            matches = async_get_directory(self.hass).municipality_index().search(
+                user_input.get(CONF_SEARCH, "")
+            )
+
+            if len(matches) == 1:
+                return await self.async_step_municipality(
+                    {CONF_MUNICIPALITY_ID: next(iter(matches))}
+                )
+            if matches:
+                self._municipality_options = matches
+                return await self.async_step_municipality()
+
+            errors["base"] = "no_matches"
+
+        return self.async_show_form(
+            step_id="municipality_search",
+            data_schema=vol.Schema({vol.Optional(CONF_SEARCH, default=""): str}),
+            errors=errors,
+            description_placeholders={
+                "municipality_count": str(len(self._municipalities))
+            }
+        )
+
     async def async_step_municipality(self, user_input=None):
         """Handle municipality selection step."""
         errors = {}
@@ -82,17 +138,12 @@ class WasteCollectionFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
             if not self._streets_data["streets"]:
                 errors["base"] = "no_streets"
             else:
-                return await self.async_step_street()
+                return await self.async_step_street_search()
 
         # Prepare municipality dropdown options
-        municipality_options = {}
-        for m in self._municipalities:
-            try:
-                key = m["id"]
-                value = f"{m['municipality']} ({m['district']}, {m['province']})"
-                municipality_options[key] = value
-            except (KeyError, TypeError):
-                _LOGGER.error("Invalid municipality data: %s", m)
+        municipality_options = self._municipality_options
+        if municipality_options is None:
+            municipality_options = async_get_directory(self.hass).municipality_index().options
 
         if not municipality_options:
             return self.async_abort(reason="no_municipalities")
@@ -108,7 +159,57 @@ class WasteCollectionFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
             data_schema=schema,
             errors=errors,
             description_placeholders={
-                "municipality_count": str(len(self._municipalities))
+                "municipality_count": str(len(municipality_options))
+            }
+        )
+
+    @callback
+    def _unconfigured(self, street_options):
+        """Drop streets of the municipality that an entry already watches.
+
+        Entities are identified by municipality and street, so a street
+        configured twice would get duplicate unique IDs.
+        """
+        configured = set()
+        for entry in self._async_current_entries():
+            if entry.data.get(CONF_MUNICIPALITY_ID) == self._municipality_id:
+                configured.update(
+                    entry.data.get(CONF_STREETS) or [entry.data.get(CONF_STREET)]
+                )
+        return {
+            key: label for key, label in street_options.items() if key not in configured
+        }
+
+    async def async_step_street_search(self, user_input=None):
+        """Narrow down the street list by a search phrase."""
+        errors = {}
+
+        if user_input is not None:
+            matches = async_get_directory(self.hass).street_index(
+                self._municipality_id
+            ).search(user_input.get(CONF_SEARCH, ""))
+            found = bool(matches)
+            matches = self._unconfigured(matches)
+
+            if matches and self._batch:
+                # Several streets are picked from the matches
+                self._street_options = matches
+                return await self.async_step_streets()
+            if len(matches) == 1:
+                return await self.async_step_street({CONF_STREET: next(iter(matches))})
+            if matches:
+                self._street_options = matches
+                return await self.async_step_street()
+
+            errors["base"] = "streets_configured" if found else "no_matches"
+
+        return self.async_show_form(
+            step_id="street_search",
+            data_schema=vol.Schema({vol.Optional(CONF_SEARCH, default=""): str}),
+            errors=errors,
+            description_placeholders={
+                "municipality_name": self._streets_data.get("municipality_name", "Unknown"),
+                "street_count": str(len(self._streets_data.get("streets", [])))
             }
         )
 
@@ -132,9 +233,11 @@ class WasteCollectionFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
             )
 
         # Prepare street dropdown options
-        street_options = {}
-        for s in self._streets_data.get("streets", []):
-            street_options[s] = s
+        street_options = self._street_options
+        if street_options is None:
+            street_options = self._unconfigured(
+                async_get_directory(self.hass).street_index(self._municipality_id).options
+            )
 
         if not street_options:
             return self.async_abort(reason="no_streets")
@@ -151,7 +254,53 @@ class WasteCollectionFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
             errors=errors,
             description_placeholders={
                 "municipality_name": municipality_name,
-                "street_count": str(len(self._streets_data.get("streets", [])))
+                "street_count": str(len(street_options))
+            }
+        )
+
+    async def async_step_streets(self, user_input=None):
+        """Handle selection of several streets."""
+        errors = {}
+
+        municipality_name = self._streets_data.get("municipality_name", "Unknown")
+
+        if user_input is not None:
+            streets = list(user_input[CONF_STREETS])
+
+            if streets:
+                return self.async_create_entry(
+                    title=f"{municipality_name} - {len(streets)} streets",
+                    data={
+                        CONF_MUNICIPALITY_ID: self._municipality_id,
+                        CONF_MUNICIPALITY_NAME: municipality_name,
+                        CONF_STREETS: streets,
+                    },
+                )
+
+            errors["base"] = "no_streets_selected"
+
+        street_options = self._street_options
+        if street_options is None:
+            street_options = self._unconfigured(
+                async_get_directory(self.hass).street_index(self._municipality_id).options
+            )
+
+        if not street_options:
+            return self.async_abort(reason="no_streets")
+
+        schema = vol.Schema(
+            {
+                vol.Required(CONF_STREETS, default=[]): cv.multi_select(street_options),
+            }
+        )
+
+        return self.async_show_form(
+            step_id="streets",
+            data_schema=schema,
+            errors=errors,
+            description_placeholders={
+                "municipality_name": municipality_name,
+                "street_count": str(len(street_options))
             }
         )
 
@@ -192,6 +341,46 @@ class OptionsFlowHandler(config_entries.OptionsFlow):
                 CONF_SCAN_INTERVAL,
                 default=default_scan_interval,
             ): cv.positive_int,
+            vol.Optional(
+                CONF_PARSER,
+                default=self.config_entry.options.get(CONF_PARSER, DEFAULT_PARSER),
+            ): vol.In(PARSERS),
+            vol.Optional(
+                CONF_MAX_COLLECTIONS,
+                default=self.config_entry.options.get(
+                    CONF_MAX_COLLECTIONS, DEFAULT_MAX_COLLECTIONS
+                ),
+            ): cv.positive_int,
+            vol.Optional(
+                CONF_COLLECTIONS_WINDOW,
+                default=self.config_entry.options.get(
+                    CONF_COLLECTIONS_WINDOW, DEFAULT_COLLECTIONS_WINDOW
+                ),
+            ): cv.positive_int,
+            vol.Optional(
+                CONF_ADAPTIVE_POLLING,
+                default=self.config_entry.options.get(
+                    CONF_ADAPTIVE_POLLING, DEFAULT_ADAPTIVE_POLLING
+                ),
+            ): cv.boolean,
+            vol.Optional(
+                CONF_MAX_CONCURRENT_REQUESTS,
+                default=self.config_entry.options.get(
+                    CONF_MAX_CONCURRENT_REQUESTS, DEFAULT_MAX_CONCURRENT_REQUESTS
+                ),
+            ): vol.All(vol.Coerce(int), vol.Range(min=1)),
+            vol.Optional(
+                CONF_REQUESTS_PER_MINUTE,
+                default=self.config_entry.options.get(
+                    CONF_REQUESTS_PER_MINUTE, DEFAULT_REQUESTS_PER_MINUTE
+                ),
+            ): vol.All(vol.Coerce(int), vol.Range(min=1)),
+            vol.Optional(
+                CONF_PARSE_IN_PROCESS,
+                default=self.config_entry.options.get(
+                    CONF_PARSE_IN_PROCESS, DEFAULT_PARSE_IN_PROCESS
+                ),
+            ): cv.boolean,
         }
 
         return self.async_show_form(step_id="init", data_schema=vol.Schema(options))
\ No newline at end of file
@@ -3,21 +3,103 @@ from datetime import timedelta
 
 DOMAIN = "trash_day"
 
+# Storage
+STORAGE_VERSION = 1
+
+# Keys in hass.data[DOMAIN]
+DATA_HUBS = "hubs"
+DATA_DIRECTORY = "directory"
+DATA_FETCHER = "fetcher"
+DATA_PARSE_EXECUTOR = "parse_executor"
+DATA_WATCHDOG = "watchdog"
+DATA_BASE_URL = "base_url"
+
 # Configuration options
 CONF_MUNICIPALITY_ID = "municipality_id"
 CONF_MUNICIPALITY_NAME = "municipality_name"
 CONF_STREET = "street"
+CONF_STREETS = "streets"
 CONF_SCAN_INTERVAL = "scan_interval"
+CONF_SEARCH = "search"
+CONF_PARSER = "parser"
+CONF_MAX_COLLECTIONS = "max_collections"
+CONF_COLLECTIONS_WINDOW = "collections_window"
+CONF_ADAPTIVE_POLLING = "adaptive_polling"
+CONF_MAX_CONCURRENT_REQUESTS = "max_concurrent_requests"
+CONF_REQUESTS_PER_MINUTE = "requests_per_minute"
+CONF_PARSE_IN_PROCESS = "parse_in_process"
+CONF_BASE_URL = "base_url"
+
+# Schedule parser backends
+PARSER_STREAMING = "streaming"
+PARSER_BEAUTIFULSOUP = "beautifulsoup"
+PARSERS = [PARSER_STREAMING, PARSER_BEAUTIFULSOUP]
 
 # Default values
 DEFAULT_SCAN_INTERVAL = timedelta(hours=12)
 DEFAULT_NAME = "Waste Collection"
+DEFAULT_PARSER = PARSER_STREAMING
+# With both limits at 0 all_collections lists every date from the start of
+# the current year; older years of the timeline are left out
+DEFAULT_MAX_COLLECTIONS = 0
+DEFAULT_COLLECTIONS_WINDOW = 0
+DEFAULT_ADAPTIVE_POLLING = False
+# Request limits are shared by all entries; the strictest configured one wins
+DEFAULT_MAX_CONCURRENT_REQUESTS = 2
+DEFAULT_REQUESTS_PER_MINUTE = 20
+DEFAULT_PARSE_IN_PROCESS = False
+
+# Adaptive polling
+ADAPTIVE_MAX_INTERVAL = timedelta(days=7)
+# Poll at the configured interval when the schedule ends within this many days
+ADAPTIVE_HORIZON_DAYS = 30
+ADAPTIVE_JITTER = 0.1
+ADAPTIVE_HISTORY = 16
+
+# Schedule timeline: collections older than this are dropped on merge
+TIMELINE_RETENTION = timedelta(days=3 * 365)
+# Number of schedule changes remembered per street
+TIMELINE_CHANGES = 20
+
+# How long downloaded municipality and street lists stay valid
+DIRECTORY_TTL = timedelta(days=7)
 
-# API URLs
+# HTTP resilience (timeouts in seconds)
+FETCH_CONNECT_TIMEOUT = 10
+FETCH_READ_TIMEOUT = 30
+FETCH_ATTEMPTS = 3
+FETCH_BACKOFF_BASE = 2
+FETCH_BACKOFF_MAX = 30
+BREAKER_FAILURE_THRESHOLD = 5
+BREAKER_RESET_TIMEOUT = timedelta(minutes=5)
+
+# Request scheduling, lower value is served first
+PRIORITY_INTERACTIVE = 0
+PRIORITY_FIRST_REFRESH = 1
+PRIORITY_BACKGROUND = 2
+# Revalidation of cached schedules is spread over this period after startup
+STARTUP_STAGGER = timedelta(seconds=60)
+# Streets of a multi-street entry fetched at the same time
+BATCH_PARALLELISM = 4
+
+# Pages at least this long (characters) are parsed in a separate process
+# when process parsing is enabled; smaller ones are not worth the transfer
+PROCESS_POOL_MIN_SIZE = 200_000
+# Event loop watchdog, active when debug logging is enabled (seconds)
+WATCHDOG_INTERVAL = 0.5
+WATCHDOG_LAG_THRESHOLD = 0.1
+
+# API URLs, BASE_URL can be overridden with base_url in configuration.yaml
 BASE_URL = "https://cloud.fxsystems.com.pl/OdbiorySmieci/HarmonogramOnline.dll"
-MUNICIPALITY_URL = BASE_URL
-STREETS_URL = BASE_URL + "?gmina_id={municipality_id}"
-SCHEDULE_URL = BASE_URL + "?gmina_id={municipality_id}&ulica={street}"
+MUNICIPALITY_URL = "{base_url}"
+STREETS_URL = "{base_url}?gmina_id={municipality_id}"
+SCHEDULE_URL = "{base_url}?gmina_id={municipality_id}&ulica={street}"
+
+# States of the days text sensors
+DAYS_TEXT_TODAY = "Dzisiaj!"
+DAYS_TEXT_TOMORROW = "Jutro!"
+DAYS_TEXT_IN_DAYS = "Za {days} dni"
+DAYS_TEXT_UNKNOWN = "Brak danych"
 
 # Attributes
 ATTR_NEXT_COLLECTION = "next_collection"
@@ -27,6 +109,13 @@ ATTR_DAYS_UNTIL = "days_until"
 ATTR_COLLECTIONS = "collections"
 ATTR_ALL_COLLECTIONS = "all_collections"
 ATTR_SCHEDULE = "schedule"
+ATTR_CONFIG_ENTRY_ID = "config_entry_id"
+ATTR_STREET = "street"
+ATTR_START = "start"
+ATTR_END = "end"
+
+# Services
+SERVICE_GET_SCHEDULE = "get_schedule"
 
 # Waste types
 WASTE_TYPES = {
@@ -37,6 +126,9 @@ WASTE_TYPES = {
     "SZ": {"name": "Glass", "name_pl": "Szkło", "icon": "mdi:bottle-wine", "color": "#7EC451"},
     "PO": {"name": "Ash", "name_pl": "Popiół", "icon": "mdi:fire", "color": "#626262"}
 }
+# Waste types found on schedule pages but not listed above get sensors with
+# this icon; their ID is the slug of the card title
+LEARNED_TYPE_ICON = "mdi:trash-can-outline"
 
 # Translation keys
 SELECTOR_MUNICIPALITY = "selector_municipality"
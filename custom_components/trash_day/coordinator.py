@@ -1,43 +1,334 @@
 """Data coordinator for TrashDay integration."""
 import logging
 import asyncio
-from datetime import datetime, date
-import aiohttp
+import hashlib
+import random
+from collections import deque
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Union
 from urllib.parse import quote
-from bs4 import BeautifulSoup
-import re
 
-from homeassistant.core import HomeAssistant
-from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
-from homeassistant.helpers.aiohttp_client import async_get_clientsession
-from homeassistant.exceptions import ConfigEntryAuthFailed
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_time_change
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+from homeassistant.util import dt as dt_util
 
 from .const import (
     DOMAIN,
+    DATA_HUBS,
+    DATA_BASE_URL,
+    BASE_URL,
     MUNICIPALITY_URL,
     STREETS_URL,
     SCHEDULE_URL,
-    WASTE_TYPES,
+    DEFAULT_PARSER,
+    ADAPTIVE_MAX_INTERVAL,
+    ADAPTIVE_HORIZON_DAYS,
+    ADAPTIVE_JITTER,
+    ADAPTIVE_HISTORY,
+    PRIORITY_INTERACTIVE,
+    PRIORITY_FIRST_REFRESH,
+    PRIORITY_BACKGROUND,
+    BATCH_PARALLELISM,
+    TIMELINE_RETENTION,
+    TIMELINE_CHANGES,
 )
+from .classifier import WasteTypeRegistry
+from .executor import async_get_parse_executor
+from .fetch import FetchError, async_get_fetcher
+from .parser import parse_municipalities, parse_schedule, parse_streets
+from .schedule import Collection, ScheduleIndex, merge_timeline
+from .store import ScheduleStore
 
 _LOGGER = logging.getLogger(__name__)
 
 
+@callback
+def async_get_base_url(hass: HomeAssistant) -> str:
+    """Return the schedule service URL, BASE_URL unless configured otherwise."""
+    return hass.data.get(DOMAIN, {}).get(DATA_BASE_URL, BASE_URL)
+
+
+def _schedule_url(base_url: str, municipality_id: str, street: str) -> str:
+    """Build the schedule URL for a street."""
+    return SCHEDULE_URL.format(
+        base_url=base_url, municipality_id=municipality_id, street=quote(street)
+    )
+
+
+@dataclass
+class ScheduleFetchResult:
+    """Parsed schedule of a street together with its HTTP validators."""
+
+    dates: List[Collection]
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    content_hash: Optional[str] = None
+    changed: bool = True
+    index: Optional[ScheduleIndex] = None
+    # Measurements of the fetch that produced this result, None when cached
+    fetch_time: Optional[float] = None
+    html_size: Optional[int] = None
+    parse_time: Optional[float] = None
+    cards_skipped: Optional[int] = None
+
+    def __post_init__(self):
+        """Index the dates unless an index is shared from a previous result."""
+        if self.index is None:
+            self.index = ScheduleIndex(self.dates)
+
+
+@dataclass
+class FetchMetrics:
+    """Timing and cache statistics of the schedule fetches of a street."""
+
+    fetches: int = 0
+    failures: int = 0
+    # Fetches answered with 304 or an unchanged body, so nothing was parsed
+    cache_hits: int = 0
+    last_fetch_time: Optional[float] = None
+    last_html_size: Optional[int] = None
+    last_parse_time: Optional[float] = None
+    cards_parsed: Optional[int] = None
+    cards_skipped: Optional[int] = None
+    last_error: Optional[str] = None
+
+    @property
+    def cache_hit_ratio(self) -> Optional[float]:
+        """Return the share of successful fetches that were cache hits."""
+        if not self.fetches:
+            return None
+        return self.cache_hits / self.fetches
+
+    def record(self, result: "ScheduleFetchResult") -> None:
+        """Count a successful fetch."""
+        self.fetches += 1
+        if not result.changed:
+            self.cache_hits += 1
+        self.last_fetch_time = result.fetch_time
+        self.last_html_size = result.html_size
+        if result.parse_time is not None:
+            self.last_parse_time = result.parse_time
+            self.cards_parsed = len(result.dates)
+            self.cards_skipped = result.cards_skipped
+
+    def record_failure(self, error: Exception) -> None:
+        """Count a failed fetch."""
+        self.failures += 1
+        self.last_error = str(error)
+
+
+class WasteCollectionHub:
+    """Shared fetcher for all coordinators of a single municipality.
+
+    Concurrent requests for the same URL are coalesced into one in-flight
+    fetch and the parsed result is handed to every coordinator that asked.
+    """
+
+    def __init__(self, hass: HomeAssistant, municipality_id: str):
+        """Initialize."""
+        self._hass = hass
+        self.municipality_id = municipality_id
+        self.base_url = async_get_base_url(hass)
+        self.fetcher = async_get_fetcher(hass)
+        self.parse_executor = async_get_parse_executor(hass)
+        self.registry = WasteTypeRegistry(hass, municipality_id)
+        self.users = 0
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._last_results: Dict[str, ScheduleFetchResult] = {}
+        # Fetch statistics of every street, shared by the coordinators
+        # watching it, and the outcome each one last counted
+        self.metrics: Dict[str, FetchMetrics] = {}
+        self._recorded: Dict[str, Union[ScheduleFetchResult, Exception]] = {}
+
+    @callback
+    def street_metrics(self, street: str) -> FetchMetrics:
+        """Return the fetch statistics of a street."""
+        return self.metrics.setdefault(street, FetchMetrics())
+
+    @callback
+    def async_record(
+        self, street: str, outcome: Union[ScheduleFetchResult, Exception]
+    ) -> None:
+        """Count the result or error of a fetch of a street.
+
+        Coordinators that joined the same in-flight request receive the same
+        outcome object, which is counted only once.
+        """
+        if self._recorded.get(street) is outcome:
+            return
+        self._recorded[street] = outcome
+        if isinstance(outcome, Exception):
+            self.street_metrics(street).record_failure(outcome)
+        else:
+            self.street_metrics(street).record(outcome)
+
+    @callback
+    def async_seed(self, street: str, result: ScheduleFetchResult) -> None:
+        """Remember a previously fetched schedule for conditional requests."""
+        url = _schedule_url(self.base_url, self.municipality_id, street)
+        self._last_results.setdefault(url, result)
+
+    async def async_fetch_schedule(
+        self,
+        street: str,
+        parser: str = DEFAULT_PARSER,
+        priority: int = PRIORITY_BACKGROUND,
+    ) -> ScheduleFetchResult:
+        """Return parsed schedule entries for a street.
+
+        The returned dates are shared between callers and must not be modified.
+        """
+        url = _schedule_url(self.base_url, self.municipality_id, street)
+
+        future = self._inflight.get(url)
+        if future is None:
+            future = self._hass.async_create_task(
+                self._async_fetch_and_parse(url, parser, priority)
+            )
+            self._inflight[url] = future
+            future.add_done_callback(lambda _: self._inflight.pop(url, None))
+        else:
+            _LOGGER.debug("Joining in-flight schedule request for %s", url)
+
+        # Shield so that a cancelled caller does not cancel the shared fetch
+        return await asyncio.shield(future)
+
+    async def _async_fetch_and_parse(
+        self, url: str, parser: str, priority: int
+    ) -> ScheduleFetchResult:
+        """Download and parse a schedule page.
+
+        The page is revalidated with ETag/Last-Modified when a previous result
+        is known, and reparsing is skipped when the body hash is unchanged.
+        """
+        previous = self._last_results.get(url)
+        headers = {}
+        if previous:
+            if previous.etag:
+                headers["If-None-Match"] = previous.etag
+            if previous.last_modified:
+                headers["If-Modified-Since"] = previous.last_modified
+
+        response = await self.fetcher.async_get(url, headers, priority)
+        if previous and response.status == 304:
+            _LOGGER.debug("Schedule not modified: %s", url)
+            return ScheduleFetchResult(
+                previous.dates,
+                previous.etag,
+                previous.last_modified,
+                previous.content_hash,
+                changed=False,
+                index=previous.index,
+                fetch_time=response.elapsed,
+                html_size=0,
+            )
+
+        html = response.text
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+
+        body = html.encode()
+        content_hash = hashlib.sha256(body).hexdigest()
+        if previous and previous.content_hash == content_hash:
+            _LOGGER.debug("Schedule content unchanged: %s", url)
+            result = ScheduleFetchResult(
+                previous.dates,
+                etag,
+                last_modified,
+                content_hash,
+                changed=False,
+                index=previous.index,
+                fetch_time=response.elapsed,
+                html_size=len(body),
+            )
+        else:
+            (dates, cards_skipped), parse_time = await self.parse_executor.async_run(
+                parse_schedule, html, parser
+            )
+            await self.registry.async_load()
+            dates = self.registry.async_classify(dates)
+            result = ScheduleFetchResult(
+                dates,
+                etag,
+                last_modified,
+                content_hash,
+                fetch_time=response.elapsed,
+                html_size=len(body),
+                parse_time=parse_time,
+                cards_skipped=cards_skipped,
+            )
+
+        self._last_results[url] = result
+        return result
+
+
+@callback
+def async_get_hub(hass: HomeAssistant, municipality_id: str) -> WasteCollectionHub:
+    """Return the shared hub for a municipality, creating it if needed."""
+    hubs = hass.data.setdefault(DOMAIN, {}).setdefault(DATA_HUBS, {})
+    hub = hubs.get(municipality_id)
+    if hub is None:
+        hub = hubs[municipality_id] = WasteCollectionHub(hass, municipality_id)
+    hub.users += 1
+    return hub
+
+
+@callback
+def async_release_hub(hass: HomeAssistant, hub: WasteCollectionHub) -> None:
+    """Drop a reference to a hub and forget it once unused."""
+    hub.users -= 1
+    if hub.users <= 0:
+        hass.data.get(DOMAIN, {}).get(DATA_HUBS, {}).pop(hub.municipality_id, None)
+
+
 class WasteCollectionCoordinator(DataUpdateCoordinator):
-    """Class to manage fetching waste collection data."""
+    """Class to manage fetching waste collection data.
+
+    A coordinator serves one or more streets of a municipality. Its data maps
+    every street that has a schedule to the data built by ``_build_data``.
+    """
 
     def __init__(
         self,
         hass: HomeAssistant,
         municipality_id: str,
-        street: str,
+        streets: List[str],
         update_interval,
+        parser: str = DEFAULT_PARSER,
+        adaptive_polling: bool = False,
     ):
         """Initialize."""
         self.municipality_id = municipality_id
-        self.street = street
-        self.session = async_get_clientsession(hass)
+        self.streets = list(streets)
+        self.parser = parser
+        self.base_update_interval = update_interval
+        self.adaptive_polling = adaptive_polling
+        # Recent changes of every street's timeline, oldest first
+        self.changes = {
+            street: deque(maxlen=TIMELINE_CHANGES) for street in self.streets
+        }
+        # Content hashes of the last fetches of every street, oldest first
+        self.hash_history = {
+            street: deque(maxlen=ADAPTIVE_HISTORY) for street in self.streets
+        }
+        # Hash of the page each street's timeline was last merged from. The
+        # hub's changed flag compares with the hub's previous fetch, which
+        # may have been made for another entry watching the same street.
+        self._merged_hashes: Dict[str, Optional[str]] = {}
+        self.hub = async_get_hub(hass, municipality_id)
+        # Fetch statistics of every street, kept by the hub
+        self.metrics = {street: self.hub.street_metrics(street) for street in self.streets}
+        self.stores = {
+            street: ScheduleStore(hass, municipality_id, street) for street in self.streets
+        }
         self._hass = hass
+        # Bumped whenever a different schedule of a street is published
+        self._data_versions: Dict[str, int] = dict.fromkeys(self.streets, 0)
+        self._last_indexes: Dict[str, ScheduleIndex] = {}
+        # Per waste type versions, bumped only for types whose dates changed
+        self._type_versions: Dict[str, Dict[str, int]] = {}
 
         super().__init__(
             hass,
@@ -46,118 +337,57 @@ class WasteCollectionCoordinator(DataUpdateCoordinator):
             update_interval=update_interval,
         )
 
+    @property
+    def failed_fetches(self) -> int:
+        """Return failed fetches since setup, including those served from last good data."""
+        return sum(metrics.failures for metrics in self.metrics.values())
+
+    def waste_type_info(self, waste_id: str) -> Optional[Dict[str, str]]:
+        """Return name, icon and color of a built-in or learned waste type."""
+        return self.hub.registry.info(waste_id)
+
+    def street_data(self, street: str) -> Optional[Dict[str, Any]]:
+        """Return the data of a street, if its schedule is known."""
+        if not self.data:
+            return None
+        return self.data.get(street)
+
     @staticmethod
     async def get_municipalities(hass: HomeAssistant):
         """Get list of available municipalities."""
-        session = async_get_clientsession(hass)
         try:
-            async with session.get(MUNICIPALITY_URL) as response:
-                response.raise_for_status()
-                html = await response.text()
-        except (aiohttp.ClientError) as error:
+            response = await async_get_fetcher(hass).async_get(
+                MUNICIPALITY_URL.format(base_url=async_get_base_url(hass)),
+                priority=PRIORITY_INTERACTIVE,
+            )
+        except FetchError as error:
             _LOGGER.error("Error fetching municipalities: %s", error)
             return []
 
-        # Parse HTML
-        soup = BeautifulSoup(html, "html.parser")
-        select_element = soup.find("select", id="selGmina")
-
-        if not select_element:
-            _LOGGER.error("Could not find select element with id='selGmina'")
-            return []
-
-        options = select_element.find_all("option")
-        municipalities = []
-
-        # Parse each option
-        for option in options:
-            value = option.get("value")
-            if not value:  # Skip empty or default option
-                continue
-
-            text = option.text.strip()
-            match = re.search(
-                r"woj\.: ([\wąćęłńóśźżĄĆĘŁŃÓŚŹŻ\s\-]+) powiat: ([\wąćęłńóśźżĄĆĘŁŃÓŚŹŻ\s\-]+) gmina: ([\wąćęłńóśźżĄĆĘŁŃÓŚŹŻ\s\-]+)",
-                text,
-            )
-
-            if match:
-                province = match.group(1).strip()
-                district = match.group(2).strip()
-                municipality = match.group(3).strip()
-
-                municipalities.append(
-                    {
-                        "id": value,
-                        "province": province,
-                        "district": district,
-                        "municipality": municipality,
-                        "full_name": text,
-                    }
-                )
-
+        municipalities, _ = await async_get_parse_executor(hass).async_run(
+            parse_municipalities, response.text
+        )
         return municipalities
 
     @staticmethod
     async def get_streets(hass: HomeAssistant, municipality_id: str):
         """Get list of available streets for a municipality."""
-        session = async_get_clientsession(hass)
-        url = STREETS_URL.format(municipality_id=municipality_id)
+        url = STREETS_URL.format(
+            base_url=async_get_base_url(hass), municipality_id=municipality_id
+        )
 
         try:
-            async with session.get(url) as response:
-                response.raise_for_status()
-                html = await response.text()
-        except (aiohttp.ClientError) as error:
+            response = await async_get_fetcher(hass).async_get(
+                url, priority=PRIORITY_INTERACTIVE
+            )
+        except FetchError as error:
             _LOGGER.error("Error fetching streets: %s", error)
             return {"streets": [], "municipality_name": "Unknown"}
 
-        # Parse HTML
-        soup = BeautifulSoup(html, "html.parser")
-
-        # Get municipality name
-        try:
-            header = soup.find("h4")
-            if header:
-                header_text = header.text
-                match = re.search(r"dla gminy: ([\wąćęłńóśźżĄĆĘŁŃÓŚŹŻ\s\-]+)", header_text)
-                if match:
-                    municipality_name = match.group(1).strip()
-                else:
-                    municipality_name = "Unknown municipality"
-            else:
-                municipality_name = "Unknown municipality"
-        except (AttributeError, IndexError):
-            municipality_name = "Unknown municipality"
-            _LOGGER.warning("Could not find municipality name")
-
-        # Find the streets select element
-        select_element = soup.find("select", id="selUlica")
-
-        if not select_element:
-            _LOGGER.error("Could not find select element with id='selUlica'")
-            return {"streets": [], "municipality_name": municipality_name}
-
-        options = select_element.find_all("option")
-        streets = []
-
-        # Parse each option
-        for option in options:
-            # Skip the hidden default option
-            if (
-                option.has_attr("hidden")
-                or option.has_attr("disabled")
-                or option.has_attr("selected")
-            ):
-                continue
-
-            street_name = option.text.strip()
-            streets.append(street_name)
-
-        return {
-            "streets": streets,
-            "municipality_name": municipality_name,
-        }
+        streets, _ = await async_get_parse_executor(hass).async_run(
+            parse_streets, response.text
+        )
+        return streets
 
     async def _async_update_data(self):
         """Fetch data from API."""
@@ -167,170 +397,305 @@ class WasteCollectionCoordinator(DataUpdateCoordinator):
             _LOGGER.error("Error fetching schedule: %s", err)
             raise
 
-    async def _fetch_schedule(self):
-        """Fetch waste collection schedule."""
-        encoded_street = quote(self.street)
-        url = SCHEDULE_URL.format(
-            municipality_id=self.municipality_id, street=encoded_street
+    @callback
+    def async_start_rollover(self) -> CALLBACK_TYPE:
+        """Recompute next collections from the cached schedule every midnight.
+
+        Days until each collection change at local midnight, which is also
+        when a collection day passes, so no network refresh is needed to keep
+        the sensors current between polls.
+        """
+        return async_track_time_change(
+            self._hass, self._async_rollover, hour=0, minute=0, second=0
         )
 
-        try:
-            async with self.session.get(url) as response:
-                response.raise_for_status()
-                html = await response.text()
-        except (aiohttp.ClientError) as error:
-            _LOGGER.error("Error fetching schedule: %s", error)
-            return {"schedule": [], "waste_types": {}}
-
-        # Parse HTML
-        soup = BeautifulSoup(html, "html.parser")
-
-        # List for schedule data
-        dates = []
-
-        # Finding all cards with dates
-        date_cards = soup.find_all("div", class_="termin card")
-
-        # Color to waste type mapping (for verification)
-        color_mapping = {
-            "#9F703B": {"name": "biodegradowalne", "id": "B"},
-            "#596D81": {"name": "zmieszane", "id": "ZM"},
-            "#F9C625": {"name": "metale i tworzywa sztuczne", "id": "PL"},
-            "#11ADE4": {"name": "papier i tektura", "id": "PA"},
-            "#7EC451": {"name": "szkło", "id": "SZ"},
-            "#626262": {"name": "popiół", "id": "PO"},
+    @callback
+    def _async_rollover(self, now: datetime) -> None:
+        """Advance next-collection pointers to the new day."""
+        if not self.data:
+            return
+        if all(data["today"] == now.date() for data in self.data.values()):
+            return
+
+        _LOGGER.debug("Day rollover for %s, recomputing next collections", self.streets)
+        self.data = {
+            street: self._build_data(street, data["index"], data["retrieval_date"])
+            for street, data in self.data.items()
         }
+        self.async_update_listeners()
 
-        # Waste type to ID mapping
-        waste_type_to_id = {
-            "biodegradowalne": "B",
-            "zmieszane": "ZM",
-            "metale i tworzywa sztuczne": "PL",
-            "papier i tektura": "PA",
-            "szkło": "SZ",
-            "popiół": "PO",
-        }
+    async def async_load_cached(self) -> bool:
+        """Serve the schedules persisted by a previous run.
 
-        # Parse each date card
-        for card in date_cards:
-            try:
-                # Get side color
-                side = card.find("div", class_="bok")
-                if not side or not side.get("style"):
-                    continue
+        Returns True when every street has a cached schedule.
+        """
+        cached_streets = await asyncio.gather(
+            *(self.stores[street].async_load() for street in self.streets)
+        )
+        await self.hub.registry.async_load()
+
+        data = {}
+        for street, cached in zip(self.streets, cached_streets):
+            if not cached:
+                continue
+            result = ScheduleFetchResult(
+                # Cards stored before their type was known are classified now
+                self.hub.registry.async_classify(cached["dates"]),
+                cached["etag"],
+                cached["last_modified"],
+                cached["content_hash"],
+                changed=False,
+            )
+            self.hub.async_seed(street, result)
+            self._merged_hashes[street] = cached["content_hash"]
+            if cached["content_hash"]:
+                self.hash_history[street].append(cached["content_hash"])
+            self.changes[street].extend(cached["changes"])
+            data[street] = self._build_data(
+                street,
+                result.index,
+                cached["retrieval_date"] or datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            )
+
+        if data:
+            self.data = data
+        return len(data) == len(self.streets)
 
-                style_attr = side.get("style", "")
-                color_match = re.search(r"background-color:(.*?);", style_attr)
-                color = color_match.group(1).strip() if color_match else ""
+    async def _fetch_schedule(self):
+        """Fetch waste collection schedules of all streets."""
+        # Entries missing any schedule are served before background polls
+        priority = PRIORITY_BACKGROUND
+        if not self.data or len(self.data) < len(self.streets):
+            priority = PRIORITY_FIRST_REFRESH
+        semaphore = asyncio.Semaphore(BATCH_PARALLELISM)
+
+        async def fetch(street: str) -> ScheduleFetchResult:
+            async with semaphore:
+                return await self.hub.async_fetch_schedule(street, self.parser, priority)
+
+        results = await asyncio.gather(
+            *(fetch(street) for street in self.streets), return_exceptions=True
+        )
 
-                # Get date
-                date_header = card.find("div", class_="naglowek")
-                if not date_header:
+        retrieval_date = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        data = {}
+        intervals = []
+        errors = []
+        for street, result in zip(self.streets, results):
+            if not isinstance(result, BaseException):
+                try:
+                    data[street] = await self._async_update_street(
+                        street, result, retrieval_date, intervals
+                    )
                     continue
+                except Exception as err:
+                    # e.g. a failed store write; the other streets are still served
+                    result = err
+            elif not isinstance(result, Exception):
+                # Cancellation ends the whole refresh
+                raise result
+
+            self.hub.async_record(street, result)
+            errors.append(result)
+            # Only unexpected errors are logged with their traceback
+            exc_info = None if isinstance(result, FetchError) else result
+            previous = self.street_data(street)
+            if previous:
+                # Keep serving the last good schedule instead of blanking sensors
+                _LOGGER.warning(
+                    "Error updating schedule of %s, keeping data from %s: %s",
+                    street,
+                    previous["retrieval_date"],
+                    result,
+                    exc_info=exc_info,
+                )
+                data[street] = previous
+            else:
+                _LOGGER.warning(
+                    "Error updating schedule of %s: %s", street, result, exc_info=exc_info
+                )
 
-                date_text = date_header.text.strip()
-                date_match = re.search(r"(\d{4}-\d{2}-\d{2})", date_text)
-                date_str = date_match.group(1) if date_match else None
+        if self.adaptive_polling:
+            # Failures fall back to the configured interval
+            interval = self.base_update_interval
+            if not errors:
+                interval = min(intervals)
+            self.update_interval = interval * random.uniform(
+                1 - ADAPTIVE_JITTER, 1 + ADAPTIVE_JITTER
+            )
+            _LOGGER.debug("Next schedule poll for %s in %s", self.streets, self.update_interval)
 
-                # Get weekday
-                weekday_match = re.search(r"\((.*?)\)", date_text)
-                weekday = weekday_match.group(1) if weekday_match else None
+        if not data:
+            raise UpdateFailed(f"Error fetching schedule: {errors[0]}")
+        return data
 
-                # Get waste type
-                content = card.find("div", class_="srodek")
-                if not content:
-                    continue
+    async def _async_update_street(
+        self,
+        street: str,
+        result: ScheduleFetchResult,
+        retrieval_date: str,
+        intervals: List[timedelta],
+    ) -> Dict[str, Any]:
+        """Merge and persist a fetched schedule and return the street's data."""
+        if self.adaptive_polling:
+            intervals.append(self._adapted_interval(street, result))
+
+        previous = self.street_data(street)
+        if previous is None or result.content_hash != self._merged_hashes.get(street):
+            index = self._merge_timeline(street, result, retrieval_date)
+            await self.stores[street].async_save(
+                index.dates,
+                result.etag,
+                result.last_modified,
+                result.content_hash,
+                retrieval_date,
+                list(self.changes[street]),
+            )
+            self._merged_hashes[street] = result.content_hash
+        else:
+            index = previous["index"]
+
+        data = self._build_data(street, index, retrieval_date)
+        # Counted only now, so a street failing above counts as one failure
+        self.hub.async_record(street, result)
+        return data
+
+    def _merge_timeline(
+        self, street: str, result: ScheduleFetchResult, retrieval_date: str
+    ) -> ScheduleIndex:
+        """Merge a fetched schedule into the street's timeline and index it.
+
+        The current index is kept when the merge changes nothing, so that
+        entities are not rewritten for a page that only changed cosmetically.
+        """
+        previous = self.street_data(street)
+        timeline = previous["index"].dates if previous else []
+        keep_since = dt_util.now().date() - TIMELINE_RETENTION
+
+        merged, added, removed = merge_timeline(timeline, result.dates, keep_since)
+        if previous and not added and not removed and len(merged) == len(timeline):
+            return previous["index"]
+
+        if previous and (added or removed):
+            _LOGGER.debug(
+                "Schedule of %s changed: %s added, %s removed",
+                street,
+                len(added),
+                len(removed),
+            )
+            self.changes[street].append(
+                {
+                    "retrieval_date": retrieval_date,
+                    "added": [[c.date, c.waste_id] for c in added],
+                    "removed": [[c.date, c.waste_id] for c in removed],
+                }
+            )
+        return ScheduleIndex(merged)
+
+    def _adapted_interval(self, street: str, result: ScheduleFetchResult) -> timedelta:
+        """Return how long the schedule of a street may go without a poll.
+
+        Every fetch that returns the same content doubles the interval, up to
+        ADAPTIVE_MAX_INTERVAL and to half of the time left until the last
+        published date. A detected change, the last weeks before the horizon
+        and December (when next year's schedule usually appears) fall back to
+        the configured interval. The coordinator polls at the shortest
+        interval of its streets, with jitter to keep entries from firing at once.
+        """
+        history = self.hash_history[street]
+        changed = bool(history) and history[-1] != result.content_hash
+        history.append(result.content_hash)
+
+        # Fetches in a row that returned the same content
+        stable_polls = 0
+        for content_hash in reversed(history):
+            if content_hash != result.content_hash:
+                break
+            stable_polls += 1
+        stable_polls -= 1
+
+        today = dt_util.now().date()
+        dates = result.index.dates
+        days_left = (dates[-1].date_obj - today).days if dates else 0
+
+        if changed or days_left <= ADAPTIVE_HORIZON_DAYS or today.month == 12:
+            interval = self.base_update_interval
+        else:
+            interval = min(
+                self.base_update_interval * 2 ** stable_polls,
+                ADAPTIVE_MAX_INTERVAL,
+                timedelta(days=days_left / 2),
+            )
+            interval = max(interval, self.base_update_interval)
+
+        _LOGGER.debug(
+            "Schedule of %s may wait %s (stable polls: %s, days to horizon: %s)",
+            street,
+            interval,
+            stable_polls,
+            days_left,
+        )
+        return interval
 
-                title = content.find("h3")
-                if not title:
-                    continue
+    @staticmethod
+    def _diff_types(
+        previous: Optional[ScheduleIndex],
+        index: ScheduleIndex,
+        versions: Dict[str, int],
+    ) -> Dict[str, int]:
+        """Return waste type versions bumped for types whose dates changed."""
+        versions = dict(versions)
+        waste_ids = set(index.entries)
+        if previous is not None:
+            waste_ids.update(previous.entries)
+
+        changed = []
+        for waste_id in waste_ids:
+            if previous is None or previous.entries_for(waste_id) != index.entries_for(
+                waste_id
+            ):
+                versions[waste_id] = versions.get(waste_id, 0) + 1
+                changed.append(waste_id)
+
+        if previous is not None:
+            _LOGGER.debug("Schedule changed for waste types: %s", sorted(changed))
+        return versions
+
+    def _build_data(self, street: str, index: ScheduleIndex, retrieval_date: str):
+        """Build sensor data of a street from its indexed schedule."""
+        previous = self._last_indexes.get(street)
+        if index is not previous:
+            self._last_indexes[street] = index
+            self._data_versions[street] = self._data_versions.get(street, 0) + 1
+            self._type_versions[street] = self._diff_types(
+                previous, index, self._type_versions.get(street, {})
+            )
 
-                waste_type = title.text.strip()
-
-                # Assign waste type ID
-                waste_id = waste_type_to_id.get(waste_type, "")
-
-                # Add date to list
-                if date_str:
-                    try:
-                        date_obj = datetime.strptime(date_str, "%Y-%m-%d").date()
-                        date_entry = {
-                            "date": date_str,
-                            "date_obj": date_obj,
-                            "weekday": weekday,
-                            "waste_type": waste_type,
-                            "waste_id": waste_id,
-                            "color": color,
-                        }
-                        dates.append(date_entry)
-                    except ValueError as date_error:
-                        _LOGGER.error("Invalid date format: %s - %s", date_str, date_error)
-
-            except Exception as e:
-                _LOGGER.error("Error processing date card: %s", e)
-
-        # Sort dates by date
-        dates.sort(key=lambda x: x["date"] if x["date"] else "")
-
-        # Group dates by waste type
-        types_schedules = {}
-        today = date.today()
-
-        for waste_id, waste_info in WASTE_TYPES.items():
-            waste_dates = [d for d in dates if d["waste_id"] == waste_id]
-
-            # Find next collection date
-            future_dates = [d for d in waste_dates if d["date_obj"] >= today]
-            next_collection = future_dates[0] if future_dates else None
-
-            if next_collection:
-                days_until = (next_collection["date_obj"] - today).days
-            else:
-                days_until = None
-
-            types_schedules[waste_id] = {
-                "name": waste_info["name"],
-                "name_pl": waste_info["name_pl"],
-                "dates": [{"date": d["date"], "date_obj": d["date_obj"], "weekday": d["weekday"]} for d in waste_dates],
-                "icon": waste_info["icon"],
-                "color": waste_info["color"],
-                "next_collection": next_collection["date"] if next_collection else None,
-                "next_collection_date_obj": next_collection["date_obj"] if next_collection else None,
-                "next_collection_weekday": next_collection["weekday"] if next_collection else None,
-                "days_until": days_until,
-            }
-
-        # Create a list of next collections for all waste types
-        next_collections = []
-        for waste_id, waste_data in types_schedules.items():
-            if waste_data["next_collection"]:
-                next_collections.append({
-                    "date": waste_data["next_collection"],
-                    "date_obj": datetime.strptime(waste_data["next_collection"], "%Y-%m-%d").date(),
-                    "weekday": waste_data["next_collection_weekday"],
-                    "waste_type": waste_data["name_pl"],
-                    "waste_id": waste_id,
-                    "days_until": waste_data["days_until"],
-                    "icon": waste_data["icon"],
-                    "color": waste_data["color"],
-                })
-
-        # Sort by date
-        next_collections.sort(key=lambda x: x["date_obj"])
-
-        # Find very next collection regardless of type
-        next_collection = next_collections[0] if next_collections else None
+        today = dt_util.now().date()
+
+        # Next collection of every known waste type, None when there is none.
+        # Collections are shared with the index, nothing is copied.
+        next_by_type = {
+            waste_id: index.next_on_or_after(waste_id, today)
+            for waste_id in self.hub.registry.waste_ids()
+        }
+        next_collections = sorted(
+            (c for c in next_by_type.values() if c is not None),
+            key=lambda c: c.date_obj,
+        )
 
         # Return processed data
         data = {
             "municipality_id": self.municipality_id,
-            "street": self.street,
-            "retrieval_date": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-            "schedule": dates,
-            "waste_types": types_schedules,
+            "street": street,
+            "data_version": self._data_versions[street],
+            "type_versions": self._type_versions[street],
+            "retrieval_date": retrieval_date,
+            "index": index,
+            "waste_types": next_by_type,
             "next_collections": next_collections,
-            "next_collection": next_collection,
-            "total_dates": len(dates),
+            "next_collection": next_collections[0] if next_collections else None,
+            "today": today,
         }
 
-        return data
\ No newline at end of file
+        return data
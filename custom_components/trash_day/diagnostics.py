@@ -0,0 +1,84 @@
+"""Diagnostics support for TrashDay integration."""
+from dataclasses import asdict
+from typing import Any, Dict
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN, DATA_WATCHDOG
+from .coordinator import WasteCollectionCoordinator
+from .executor import async_get_parse_executor
+from .fetch import async_get_fetcher
+
+
+def _street_diagnostics(
+    coordinator: WasteCollectionCoordinator, street: str
+) -> Dict[str, Any]:
+    """Return the schedule summary and fetch statistics of a street."""
+    metrics = coordinator.metrics[street]
+    result = {
+        "metrics": {**asdict(metrics), "cache_hit_ratio": metrics.cache_hit_ratio},
+        "hash_history": list(coordinator.hash_history[street]),
+        "changes": list(coordinator.changes[street]),
+    }
+
+    data = coordinator.street_data(street)
+    if data:
+        dates = data["index"].dates
+        result["schedule"] = {
+            "retrieval_date": data["retrieval_date"],
+            "data_version": data["data_version"],
+            "type_versions": data["type_versions"],
+            "total_dates": len(dates),
+            "first_date": dates[0].date if dates else None,
+            "last_date": dates[-1].date if dates else None,
+            "next_collections": [
+                {"date": c.date, "waste_id": c.waste_id}
+                for c in data["next_collections"]
+            ],
+        }
+    return result
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> Dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    coordinator: WasteCollectionCoordinator = hass.data[DOMAIN][entry.entry_id]
+    fetcher = async_get_fetcher(hass)
+    watchdog = hass.data[DOMAIN].get(DATA_WATCHDOG)
+
+    return {
+        "entry": {"data": dict(entry.data), "options": dict(entry.options)},
+        "coordinator": {
+            "last_update_success": coordinator.last_update_success,
+            "update_interval": str(coordinator.update_interval),
+            "base_update_interval": str(coordinator.base_update_interval),
+            "adaptive_polling": coordinator.adaptive_polling,
+            "parser": coordinator.parser,
+            "parse_in_process": async_get_parse_executor(hass).use_processes,
+            "learned_waste_types": coordinator.hub.registry.types,
+        },
+        "streets": {
+            street: _street_diagnostics(coordinator, street)
+            for street in coordinator.streets
+        },
+        "service": {
+            "breakers": {
+                host: {"failures": breaker.failures, "open": breaker.is_open}
+                for host, breaker in fetcher.breakers.items()
+            },
+            "limits": {
+                "max_concurrent": fetcher.scheduler.max_concurrent,
+                "requests_per_minute": fetcher.scheduler.requests_per_minute,
+            },
+            "queues": {
+                host: {"active": limiter.active, "waiting": limiter.waiting}
+                for host, limiter in fetcher.scheduler.hosts.items()
+            },
+        },
+        # Only collected while debug logging is enabled
+        "event_loop": None
+        if watchdog is None
+        else {"max_lag": watchdog.max_lag, "stalls": watchdog.stalls},
+    }
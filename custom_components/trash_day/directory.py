@@ -0,0 +1,192 @@
+"""Cached municipality and street directory for TrashDay integration."""
+import bisect
+import logging
+import re
+import time
+from typing import Any, Dict, List, Optional
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+
+from .const import BASE_URL, DOMAIN, DATA_DIRECTORY, DIRECTORY_TTL, STORAGE_VERSION
+from .coordinator import WasteCollectionCoordinator, async_get_base_url
+from .parser import normalize
+
+_LOGGER = logging.getLogger(__name__)
+
+# Hyphenated names such as "Żółkiewka-17" are one word
+_WORD_RE = re.compile(r"\w+(?:-\w+)*")
+
+
+class SearchIndex:
+    """Prefix index over option labels, tolerant of case and diacritics.
+
+    Every word of every label is kept in one sorted list, so looking up a
+    prefix is a binary search instead of a scan over all options. Parts of
+    hyphenated words are indexed too, but a hyphenated query word only
+    matches the whole word.
+    """
+
+    def __init__(self, options: Dict[str, str]):
+        """Build the index from a key to label mapping."""
+        self.options = options
+        self._keys = list(options)
+        words = set()
+        for pos, label in enumerate(options.values()):
+            for word in _WORD_RE.findall(normalize(label)):
+                words.add((word, pos))
+                if "-" in word:
+                    words.update((part, pos) for part in word.split("-"))
+        self._words = sorted(words)
+
+    def _prefix_matches(self, prefix: str) -> set:
+        start = bisect.bisect_left(self._words, (prefix,))
+        matches = set()
+        for word, pos in self._words[start:]:
+            if not word.startswith(prefix):
+                break
+            matches.add(pos)
+        return matches
+
+    def search(self, query: str, limit: Optional[int] = None) -> Dict[str, str]:
+        """Return options whose words start with every word of the query."""
+        terms = _WORD_RE.findall(normalize(query))
+        if not terms:
+            return dict(self.options)
+
+        positions = None
+        for term in terms:
+            matches = self._prefix_matches(term)
+            positions = matches if positions is None else positions & matches
+            if not positions:
+                return {}
+
+        keys = [self._keys[pos] for pos in sorted(positions)]
+        if limit is not None:
+            keys = keys[:limit]
+        return {key: self.options[key] for key in keys}
+
+
+def _municipality_label(municipality: Dict[str, Any]) -> str:
+    return f"{municipality['municipality']} ({municipality['district']}, {municipality['province']})"
+
+
+class MunicipalityDirectory:
+    """Municipalities and their streets, cached in memory and on disk."""
+
+    def __init__(self, hass: HomeAssistant):
+        """Initialize."""
+        self._hass = hass
+        self._store = Store(hass, STORAGE_VERSION, f"{DOMAIN}.directory")
+        self._loaded = False
+        self._municipalities: List[Dict[str, Any]] = []
+        self._municipalities_fetched = 0.0
+        self._streets: Dict[str, Dict[str, Any]] = {}
+        self._indexes: Dict[Optional[str], SearchIndex] = {}
+
+    @staticmethod
+    def _is_fresh(fetched: float) -> bool:
+        return time.time() - fetched < DIRECTORY_TTL.total_seconds()
+
+    async def _async_load(self) -> None:
+        if self._loaded:
+            return
+        self._loaded = True
+        try:
+            stored = await self._store.async_load()
+        except Exception as e:
+            _LOGGER.warning("Could not load municipality directory: %s", e)
+            return
+        if stored and stored.get("base_url", BASE_URL) != async_get_base_url(self._hass):
+            # Cached from another schedule service, e.g. before pointing at a test server
+            _LOGGER.debug("Ignoring municipality directory of %s", stored.get("base_url"))
+        elif stored:
+            self._municipalities = stored.get("municipalities", [])
+            self._municipalities_fetched = stored.get("municipalities_fetched", 0.0)
+            self._streets = stored.get("streets", {})
+
+    @callback
+    def _data_to_save(self) -> Dict[str, Any]:
+        return {
+            "base_url": async_get_base_url(self._hass),
+            "municipalities": self._municipalities,
+            "municipalities_fetched": self._municipalities_fetched,
+            "streets": self._streets,
+        }
+
+    async def async_get_municipalities(self) -> List[Dict[str, Any]]:
+        """Return municipalities, downloading them only when the cache expired."""
+        await self._async_load()
+        if self._municipalities and self._is_fresh(self._municipalities_fetched):
+            return self._municipalities
+
+        municipalities = await WasteCollectionCoordinator.get_municipalities(self._hass)
+        if municipalities:
+            self._municipalities = municipalities
+            self._municipalities_fetched = time.time()
+            self._indexes.pop(None, None)
+            self._store.async_delay_save(self._data_to_save)
+        elif self._municipalities:
+            _LOGGER.warning("Using stale municipality list")
+
+        return self._municipalities
+
+    async def async_get_streets(self, municipality_id: str) -> Dict[str, Any]:
+        """Return streets of a municipality, downloading them only when needed."""
+        await self._async_load()
+        cached = self._streets.get(municipality_id)
+        if cached and self._is_fresh(cached["fetched"]):
+            return cached
+
+        streets_data = await WasteCollectionCoordinator.get_streets(
+            self._hass, municipality_id
+        )
+        if streets_data["streets"]:
+            cached = self._streets[municipality_id] = {
+                "streets": streets_data["streets"],
+                "municipality_name": streets_data["municipality_name"],
+                "fetched": time.time(),
+            }
+            self._indexes.pop(municipality_id, None)
+            self._store.async_delay_save(self._data_to_save)
+        elif cached:
+            _LOGGER.warning("Using stale street list for %s", municipality_id)
+        else:
+            return streets_data
+
+        return cached
+
+    @callback
+    def municipality_index(self) -> SearchIndex:
+        """Return the search index of the cached municipalities."""
+        index = self._indexes.get(None)
+        if index is None:
+            options = {}
+            for m in self._municipalities:
+                try:
+                    options[m["id"]] = _municipality_label(m)
+                except (KeyError, TypeError):
+                    _LOGGER.error("Invalid municipality data: %s", m)
+            index = self._indexes[None] = SearchIndex(options)
+        return index
+
+    @callback
+    def street_index(self, municipality_id: str) -> SearchIndex:
+        """Return the search index of the cached streets of a municipality."""
+        index = self._indexes.get(municipality_id)
+        if index is None:
+            streets = self._streets.get(municipality_id, {}).get("streets", [])
+            index = self._indexes[municipality_id] = SearchIndex(
+                {s: s for s in streets}
+            )
+        return index
+
+
+@callback
+def async_get_directory(hass: HomeAssistant) -> MunicipalityDirectory:
+    """Return the shared municipality directory."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    directory = domain_data.get(DATA_DIRECTORY)
+    if directory is None:
+        directory = domain_data[DATA_DIRECTORY] = MunicipalityDirectory(hass)
+    return directory
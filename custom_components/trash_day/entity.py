@@ -0,0 +1,119 @@
+"""Base entity for TrashDay integration."""
+from datetime import date
+from typing import Any, Dict, Optional
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import callback
+from homeassistant.helpers.entity import DeviceInfo
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    DOMAIN,
+    CONF_MUNICIPALITY_ID,
+    CONF_MUNICIPALITY_NAME,
+)
+from .coordinator import WasteCollectionCoordinator
+from .schedule import ScheduleIndex
+
+
+class WasteCollectionEntity(CoordinatorEntity):
+    """Base class for waste collection entities."""
+
+    def __init__(
+        self,
+        coordinator: WasteCollectionCoordinator,
+        config_entry: ConfigEntry,
+        street: str,
+    ):
+        """Initialize the entity."""
+        super().__init__(coordinator)
+        self.config_entry = config_entry
+        self.municipality_id = config_entry.data[CONF_MUNICIPALITY_ID]
+        self.municipality_name = config_entry.data.get(CONF_MUNICIPALITY_NAME, "Unknown")
+        self.street = street
+        self._attrs_key = None
+        # Key of the last state written on a coordinator update. Kept apart
+        # from _attrs_key, which Home Assistant does not refresh while the
+        # entity is unavailable.
+        self._written_key = None
+        self._attrs: Dict[str, Any] = {}
+
+    @property
+    def device_info(self) -> DeviceInfo:
+        """Return device info."""
+        return DeviceInfo(
+            identifiers={(DOMAIN, self.municipality_id)},
+            name=f"Waste Collection - {self.municipality_name}",
+            manufacturer="kiedysmieci.info",
+            model="Waste Collection Schedule",
+            sw_version="0.1.0",
+        )
+
+    @property
+    def available(self) -> bool:
+        """Return if entity is available."""
+        return super().available and self._street_data is not None
+
+    @property
+    def _street_data(self) -> Optional[Dict[str, Any]]:
+        """Return the coordinator data of the entity's street."""
+        return self.coordinator.street_data(self.street)
+
+    @property
+    def _index(self) -> Optional[ScheduleIndex]:
+        """Return the indexed schedule of the entity's street."""
+        data = self._street_data
+        if not data:
+            return None
+        return data.get("index")
+
+    @property
+    def _data_version(self) -> Optional[int]:
+        """Return the version of the street's schedule."""
+        data = self._street_data
+        return data["data_version"] if data else None
+
+    @property
+    def _today(self) -> date:
+        """Return the day the street's data was computed for."""
+        data = self._street_data
+        return data["today"] if data else dt_util.now().date()
+
+    def _data_key(self):
+        """Return the part of the street's data the entity is built from.
+
+        Entities that show only part of the schedule narrow this down so that
+        a refresh changing other waste types does not rewrite their state.
+        """
+        return self._data_version
+
+    def _state_key(self):
+        """Return what the state and attributes of the entity depend on."""
+        return (
+            self._data_key(),
+            self._today,
+            self.available,
+        )
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write state only when the schedule, the day or availability changed."""
+        key = self._state_key()
+        if key == self._written_key:
+            return
+        self.async_write_ha_state()
+        self._written_key = key
+
+    @property
+    def extra_state_attributes(self) -> Dict[str, Any]:
+        """Return additional attributes, rebuilt only when their inputs changed."""
+        key = self._state_key()
+        if key != self._attrs_key:
+            self._attrs = self._build_attributes()
+            self._attrs_key = key
+        return self._attrs
+
+    def _build_attributes(self) -> Dict[str, Any]:
+        """Build additional attributes."""
+        return {}
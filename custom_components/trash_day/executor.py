@@ -0,0 +1,163 @@
+"""Off-loop page parsing for TrashDay integration."""
+import asyncio
+import logging
+import time
+from typing import TYPE_CHECKING, Any, Callable, Optional, Tuple
+
+from homeassistant.const import EVENT_HOMEASSISTANT_STOP
+from homeassistant.core import Event, HomeAssistant, callback
+
+from .const import (
+    DOMAIN,
+    DATA_PARSE_EXECUTOR,
+    DATA_WATCHDOG,
+    CONF_PARSE_IN_PROCESS,
+    DEFAULT_PARSE_IN_PROCESS,
+    PROCESS_POOL_MIN_SIZE,
+    WATCHDOG_INTERVAL,
+    WATCHDOG_LAG_THRESHOLD,
+)
+
+if TYPE_CHECKING:
+    from concurrent.futures import ProcessPoolExecutor
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def _timed(func: Callable[..., Any], *args: Any) -> Tuple[Any, float]:
+    """Return the result of func and the seconds it took, measured in the worker."""
+    started = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - started
+
+
+class ParseExecutor:
+    """Runs page parsers outside the event loop.
+
+    Parsers run in Home Assistant's thread pool. With process parsing enabled,
+    pages of at least PROCESS_POOL_MIN_SIZE characters are parsed in a single
+    worker process instead, so that a long parse does not hold the GIL that
+    the event loop needs.
+    """
+
+    def __init__(self, hass: HomeAssistant):
+        """Initialize."""
+        self._hass = hass
+        self.use_processes = False
+        self._pool: Optional["ProcessPoolExecutor"] = None
+
+    def _get_pool(self) -> "ProcessPoolExecutor":
+        if self._pool is None:
+            # Imported here, most installations never parse in a process
+            import multiprocessing
+            from concurrent.futures import ProcessPoolExecutor
+
+            # Spawn, forking a process with running threads is not safe
+            self._pool = ProcessPoolExecutor(
+                max_workers=1, mp_context=multiprocessing.get_context("spawn")
+            )
+        return self._pool
+
+    async def async_run(
+        self, func: Callable[..., Any], html: str, *args: Any
+    ) -> Tuple[Any, float]:
+        """Return func(html, *args) and its run time in seconds."""
+        if self.use_processes and len(html) >= PROCESS_POOL_MIN_SIZE:
+            from concurrent.futures.process import BrokenProcessPool
+
+            try:
+                return await asyncio.get_running_loop().run_in_executor(
+                    self._get_pool(), _timed, func, html, *args
+                )
+            except BrokenProcessPool as error:
+                _LOGGER.warning(
+                    "Parser process failed, parsing in threads from now on: %s", error
+                )
+                self.use_processes = False
+                self.shutdown()
+
+        return await self._hass.async_add_executor_job(_timed, func, html, *args)
+
+    def shutdown(self) -> None:
+        """Stop the worker process, if one was started."""
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+
+@callback
+def async_get_parse_executor(hass: HomeAssistant) -> ParseExecutor:
+    """Return the parse executor shared by all entries and config flows."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    executor = domain_data.get(DATA_PARSE_EXECUTOR)
+    if executor is None:
+        executor = domain_data[DATA_PARSE_EXECUTOR] = ParseExecutor(hass)
+
+        @callback
+        def _async_shutdown(event: Event) -> None:
+            executor.shutdown()
+
+        hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, _async_shutdown)
+    return executor
+
+
+@callback
+def async_configure_parsing(hass: HomeAssistant) -> None:
+    """Enable process parsing when any entry asks for it."""
+    async_get_parse_executor(hass).use_processes = any(
+        entry.options.get(CONF_PARSE_IN_PROCESS, DEFAULT_PARSE_IN_PROCESS)
+        for entry in hass.config_entries.async_entries(DOMAIN)
+    )
+
+
+class LoopWatchdog:
+    """Measures how late the event loop runs a timer, to spot blocking code."""
+
+    def __init__(self, hass: HomeAssistant):
+        """Initialize."""
+        self._loop = hass.loop
+        self._expected = 0.0
+        self._handle: Optional[asyncio.TimerHandle] = None
+        self.max_lag = 0.0
+        self.stalls = 0
+
+    def start(self) -> None:
+        """Start sampling."""
+        self._schedule()
+
+    def stop(self) -> None:
+        """Stop sampling."""
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+
+    def _schedule(self) -> None:
+        self._expected = self._loop.time() + WATCHDOG_INTERVAL
+        self._handle = self._loop.call_at(self._expected, self._check)
+
+    def _check(self) -> None:
+        lag = self._loop.time() - self._expected
+        self.max_lag = max(self.max_lag, lag)
+        if lag >= WATCHDOG_LAG_THRESHOLD:
+            self.stalls += 1
+            _LOGGER.debug("Event loop was blocked for %.0f ms", lag * 1000)
+        self._schedule()
+
+
+@callback
+def async_start_watchdog(hass: HomeAssistant) -> Optional[LoopWatchdog]:
+    """Start the loop watchdog once, if debug logging is enabled."""
+    if not _LOGGER.isEnabledFor(logging.DEBUG):
+        return None
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    watchdog = domain_data.get(DATA_WATCHDOG)
+    if watchdog is None:
+        watchdog = domain_data[DATA_WATCHDOG] = LoopWatchdog(hass)
+        watchdog.start()
+
+        @callback
+        def _async_stop(event: Event) -> None:
+            watchdog.stop()
+
+        hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, _async_stop)
+    return watchdog
@@ -0,0 +1,235 @@
+"""Resilient HTTP access to the schedule service for TrashDay integration."""
+import asyncio
+import logging
+import random
+import time
+from typing import Dict, NamedTuple, Optional
+from urllib.parse import urlsplit
+
+import aiohttp
+from multidict import CIMultiDictProxy
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+
+from .const import (
+    DOMAIN,
+    DATA_FETCHER,
+    CONF_MAX_CONCURRENT_REQUESTS,
+    CONF_REQUESTS_PER_MINUTE,
+    DEFAULT_MAX_CONCURRENT_REQUESTS,
+    DEFAULT_REQUESTS_PER_MINUTE,
+    PRIORITY_BACKGROUND,
+    FETCH_CONNECT_TIMEOUT,
+    FETCH_READ_TIMEOUT,
+    FETCH_ATTEMPTS,
+    FETCH_BACKOFF_BASE,
+    FETCH_BACKOFF_MAX,
+    BREAKER_FAILURE_THRESHOLD,
+    BREAKER_RESET_TIMEOUT,
+)
+from .limiter import RequestScheduler
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class FetchError(Exception):
+    """Request failed after all retries."""
+
+
+class CircuitOpenError(FetchError):
+    """Request was not sent because the host is failing."""
+
+
+class FetchResponse(NamedTuple):
+    """Status, body and headers of a completed request."""
+
+    status: int
+    text: str
+    headers: CIMultiDictProxy
+    # Seconds taken by the successful attempt, without queueing and retries
+    elapsed: float
+
+
+class CircuitBreaker:
+    """Stop sending requests to a host after repeated failures.
+
+    After BREAKER_FAILURE_THRESHOLD consecutive failures the circuit opens and
+    requests fail immediately. Once BREAKER_RESET_TIMEOUT has passed a single
+    trial request is let through; its outcome closes or reopens the circuit.
+    """
+
+    def __init__(self, host: str):
+        """Initialize."""
+        self.host = host
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self._trial_running = False
+
+    @property
+    def is_open(self) -> bool:
+        """Return True while requests are being rejected."""
+        return self.opened_at is not None
+
+    def allow(self) -> bool:
+        """Return True if a request may be sent now."""
+        if self.opened_at is None:
+            return True
+        if self._trial_running:
+            return False
+        if time.monotonic() - self.opened_at >= BREAKER_RESET_TIMEOUT.total_seconds():
+            self._trial_running = True
+            return True
+        return False
+
+    def record_success(self) -> None:
+        """Close the circuit after a successful request."""
+        if self.opened_at is not None:
+            _LOGGER.info("Schedule service %s is reachable again", self.host)
+        self.failures = 0
+        self.opened_at = None
+        self._trial_running = False
+
+    def end_trial(self) -> None:
+        """Allow a new trial request after one that ended without an outcome."""
+        self._trial_running = False
+
+    def record_failure(self) -> None:
+        """Count a failed request and open the circuit when needed."""
+        self.failures += 1
+        self._trial_running = False
+        if self.opened_at is not None or self.failures >= BREAKER_FAILURE_THRESHOLD:
+            if self.opened_at is None:
+                _LOGGER.warning(
+                    "Schedule service %s failed %s times in a row, pausing requests",
+                    self.host,
+                    self.failures,
+                )
+            self.opened_at = time.monotonic()
+
+
+def _is_retryable(error: Exception) -> bool:
+    """Return True for errors worth retrying and counting against the host."""
+    if isinstance(error, aiohttp.ClientResponseError):
+        return error.status >= 500 or error.status == 429
+    return isinstance(error, (aiohttp.ClientError, asyncio.TimeoutError))
+
+
+class ResilientFetcher:
+    """GET requests with timeouts, bounded retries and per-host breakers.
+
+    Every attempt waits for a slot from the shared request scheduler, so
+    retries count against the same concurrency and rate limits.
+    """
+
+    def __init__(self, hass: HomeAssistant):
+        """Initialize."""
+        self.session = async_get_clientsession(hass)
+        self.breakers: Dict[str, CircuitBreaker] = {}
+        self.scheduler = RequestScheduler()
+        self._timeout = aiohttp.ClientTimeout(
+            total=None,
+            sock_connect=FETCH_CONNECT_TIMEOUT,
+            sock_read=FETCH_READ_TIMEOUT,
+        )
+
+    def _breaker(self, host: str) -> CircuitBreaker:
+        breaker = self.breakers.get(host)
+        if breaker is None:
+            breaker = self.breakers[host] = CircuitBreaker(host)
+        return breaker
+
+    async def async_get(
+        self,
+        url: str,
+        headers: Optional[Dict[str, str]] = None,
+        priority: int = PRIORITY_BACKGROUND,
+    ) -> FetchResponse:
+        """Return the response to a GET request, retrying transient failures."""
+        host = urlsplit(url).netloc
+        breaker = self._breaker(host)
+        last_error: Optional[Exception] = None
+
+        for attempt in range(FETCH_ATTEMPTS):
+            try:
+                async with self.scheduler.slot(host, priority):
+                    # The breaker may have opened while the request was queued
+                    trial = breaker.is_open
+                    if not breaker.allow():
+                        raise CircuitOpenError(f"Requests to {host} are paused")
+
+                    try:
+                        started = time.monotonic()
+                        async with self.session.get(
+                            url, headers=headers, timeout=self._timeout
+                        ) as response:
+                            if response.status != 304:
+                                response.raise_for_status()
+                            text = await response.text() if response.status != 304 else ""
+                            breaker.record_success()
+                            return FetchResponse(
+                                response.status,
+                                text,
+                                response.headers,
+                                time.monotonic() - started,
+                            )
+                    finally:
+                        # A trial ended by a decode error or cancellation must
+                        # not keep the circuit open until a restart
+                        if trial:
+                            breaker.end_trial()
+            except (aiohttp.ClientError, asyncio.TimeoutError) as error:
+                last_error = error
+                if not _is_retryable(error):
+                    # The host answered, so it is healthy; the request is wrong
+                    breaker.record_success()
+                    raise FetchError(f"Request to {url} failed: {error}") from error
+                breaker.record_failure()
+
+            if attempt + 1 < FETCH_ATTEMPTS:
+                delay = min(FETCH_BACKOFF_BASE * 2 ** attempt, FETCH_BACKOFF_MAX)
+                delay *= random.uniform(0.5, 1.0)
+                _LOGGER.debug(
+                    "Request to %s failed (%s), retrying in %.1f s", url, last_error, delay
+                )
+                await asyncio.sleep(delay)
+
+        # Timeouts have no message of their own
+        reason = str(last_error) or type(last_error).__name__
+        raise FetchError(
+            f"Request to {url} failed after {FETCH_ATTEMPTS} attempts: {reason}"
+        ) from last_error
+
+
+@callback
+def async_get_fetcher(hass: HomeAssistant) -> ResilientFetcher:
+    """Return the fetcher shared by all entries and config flows."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    fetcher = domain_data.get(DATA_FETCHER)
+    if fetcher is None:
+        fetcher = domain_data[DATA_FETCHER] = ResilientFetcher(hass)
+    return fetcher
+
+
+@callback
+def async_configure_limits(hass: HomeAssistant) -> None:
+    """Apply the strictest request limits configured in any entry."""
+    entries = hass.config_entries.async_entries(DOMAIN)
+    async_get_fetcher(hass).scheduler.configure(
+        min(
+            (
+                entry.options.get(
+                    CONF_MAX_CONCURRENT_REQUESTS, DEFAULT_MAX_CONCURRENT_REQUESTS
+                )
+                for entry in entries
+            ),
+            default=DEFAULT_MAX_CONCURRENT_REQUESTS,
+        ),
+        min(
+            (
+                entry.options.get(CONF_REQUESTS_PER_MINUTE, DEFAULT_REQUESTS_PER_MINUTE)
+                for entry in entries
+            ),
+            default=DEFAULT_REQUESTS_PER_MINUTE,
+        ),
+    )
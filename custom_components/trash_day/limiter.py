@@ -0,0 +1,153 @@
+"""Integration-wide request scheduling for TrashDay integration."""
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+from contextlib import asynccontextmanager
+from typing import Dict, List, Optional, Tuple
+
+from .const import (
+    DEFAULT_MAX_CONCURRENT_REQUESTS,
+    DEFAULT_REQUESTS_PER_MINUTE,
+    PRIORITY_BACKGROUND,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class _HostLimiter:
+    """Concurrency limit and token bucket of a single host.
+
+    Waiters are served in priority order, then first come first served.
+    """
+
+    def __init__(self, scheduler: "RequestScheduler", host: str):
+        """Initialize."""
+        self._scheduler = scheduler
+        self.host = host
+        self.active = 0
+        self.tokens = float(scheduler.max_concurrent)
+        self._updated = time.monotonic()
+        self._waiters: List[Tuple[int, int, asyncio.Future]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+
+    @property
+    def waiting(self) -> int:
+        """Return the number of queued requests."""
+        return sum(1 for _, _, future in self._waiters if not future.done())
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        rate = self._scheduler.requests_per_minute / 60
+        burst = self._scheduler.max_concurrent
+        self.tokens = min(burst, self.tokens + (now - self._updated) * rate)
+        self._updated = now
+
+    def _can_start(self) -> bool:
+        return self.active < self._scheduler.max_concurrent and self.tokens >= 1
+
+    def _start(self) -> None:
+        self.active += 1
+        self.tokens -= 1
+
+    async def acquire(self, priority: int) -> None:
+        """Wait until a request may be sent."""
+        self._refill()
+        if not self._waiters and self._can_start():
+            self._start()
+            return
+
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(
+            self._waiters, (priority, next(self._scheduler.sequence), future)
+        )
+        _LOGGER.debug(
+            "Request to %s queued (priority %s, %s waiting)",
+            self.host,
+            priority,
+            len(self._waiters),
+        )
+        self.dispatch()
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # Slot was granted just before the caller was cancelled
+                self.release()
+            raise
+
+    def release(self) -> None:
+        """Free the slot of a finished request."""
+        self.active -= 1
+        self.dispatch()
+
+    def dispatch(self) -> None:
+        """Start queued requests while slots and tokens are available."""
+        self._refill()
+        while self._waiters and self._can_start():
+            _, _, future = heapq.heappop(self._waiters)
+            if future.done():
+                continue
+            self._start()
+            future.set_result(None)
+
+        if self._waiters and self._timer is None and self.active < self._scheduler.max_concurrent:
+            # Wake up when the next token is available
+            rate = self._scheduler.requests_per_minute / 60
+            delay = (1 - self.tokens) / rate
+            self._timer = asyncio.get_running_loop().call_later(delay, self._on_timer)
+
+    def _on_timer(self) -> None:
+        self._timer = None
+        self.dispatch()
+
+
+class RequestScheduler:
+    """Per-host concurrency and rate limits shared by all requests.
+
+    Every request takes a slot from the limiter of its host. A host allows at
+    most ``max_concurrent`` requests in flight and refills request tokens at
+    ``requests_per_minute``; requests beyond that wait in a priority queue so
+    that config flows and first refreshes overtake background polls.
+    """
+
+    def __init__(
+        self,
+        max_concurrent: int = DEFAULT_MAX_CONCURRENT_REQUESTS,
+        requests_per_minute: int = DEFAULT_REQUESTS_PER_MINUTE,
+    ):
+        """Initialize."""
+        self.max_concurrent = max_concurrent
+        self.requests_per_minute = requests_per_minute
+        self.sequence = itertools.count()
+        self.hosts: Dict[str, _HostLimiter] = {}
+
+    def configure(self, max_concurrent: int, requests_per_minute: int) -> None:
+        """Change the limits, applying them to queued requests too."""
+        if (max_concurrent, requests_per_minute) == (
+            self.max_concurrent,
+            self.requests_per_minute,
+        ):
+            return
+        _LOGGER.debug(
+            "Request limits: %s concurrent, %s per minute",
+            max_concurrent,
+            requests_per_minute,
+        )
+        self.max_concurrent = max_concurrent
+        self.requests_per_minute = requests_per_minute
+        for limiter in self.hosts.values():
+            limiter.dispatch()
+
+    @asynccontextmanager
+    async def slot(self, host: str, priority: int = PRIORITY_BACKGROUND):
+        """Hold a request slot of a host for the duration of the block."""
+        limiter = self.hosts.get(host)
+        if limiter is None:
+            limiter = self.hosts[host] = _HostLimiter(self, host)
+        await limiter.acquire(priority)
+        try:
+            yield
+        finally:
+            limiter.release()
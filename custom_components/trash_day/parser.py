@@ -0,0 +1,390 @@
+"""Schedule page parsers for TrashDay integration."""
+import logging
+import re
+import unicodedata
+from datetime import date
+from functools import lru_cache
+from html.parser import HTMLParser
+from types import MappingProxyType
+from typing import Any, Dict, List, Optional, Tuple
+
+from .const import PARSER_BEAUTIFULSOUP, PARSER_STREAMING
+from .schedule import Collection
+
+_LOGGER = logging.getLogger(__name__)
+
+_COLOR_RE = re.compile(r"background-color:(.*?);")
+_DATE_RE = re.compile(r"(\d{4}-\d{2}-\d{2})")
+_WEEKDAY_RE = re.compile(r"\((.*?)\)")
+# \w matches Polish letters too
+_MUNICIPALITY_RE = re.compile(
+    r"woj\.: ([\w\s\-]+) powiat: ([\w\s\-]+) gmina: ([\w\s\-]+)"
+)
+_MUNICIPALITY_NAME_RE = re.compile(r"dla gminy: ([\w\s\-]+)")
+
+# Letters that do not decompose into a base letter and a combining mark
+_EXTRA_FOLDS = str.maketrans({"ł": "l", "Ł": "l"})
+
+
+def normalize(text: str) -> str:
+    """Lowercase text and strip Polish diacritics."""
+    decomposed = unicodedata.normalize("NFKD", text.translate(_EXTRA_FOLDS))
+    return "".join(c for c in decomposed if not unicodedata.combining(c)).casefold()
+
+
+def waste_type_key(waste_type: str) -> str:
+    """Return a waste type name folded for matching, with single spaces."""
+    return " ".join(normalize(waste_type).split())
+
+
+# Waste type to ID mapping
+WASTE_TYPE_TO_ID = MappingProxyType({
+    "biodegradowalne": "B",
+    "zmieszane": "ZM",
+    "metale i tworzywa sztuczne": "PL",
+    "papier i tektura": "PA",
+    "szkło": "SZ",
+    "popiół": "PO",
+})
+
+# Color to waste type mapping, used when the text of a card is not recognized
+COLOR_MAPPING = MappingProxyType({
+    "#9F703B": {"name": "biodegradowalne", "id": "B"},
+    "#596D81": {"name": "zmieszane", "id": "ZM"},
+    "#F9C625": {"name": "metale i tworzywa sztuczne", "id": "PL"},
+    "#11ADE4": {"name": "papier i tektura", "id": "PA"},
+    "#7EC451": {"name": "szkło", "id": "SZ"},
+    "#626262": {"name": "popiół", "id": "PO"},
+})
+
+_WASTE_IDS_BY_NAME = MappingProxyType(
+    {waste_type_key(name): waste_id for name, waste_id in WASTE_TYPE_TO_ID.items()}
+)
+_WASTE_IDS_BY_COLOR = MappingProxyType(
+    {color.upper(): info["id"] for color, info in COLOR_MAPPING.items()}
+)
+
+
+def _soup(html: str):
+    """Return the BeautifulSoup tree of a page.
+
+    bs4 is imported on first use, which happens in an executor, so that
+    loading the integration does not pay for it on the event loop.
+    """
+    from bs4 import BeautifulSoup
+
+    return BeautifulSoup(html, "html.parser")
+
+
+@lru_cache(maxsize=64)
+def resolve_waste_id(waste_type: str, color: str) -> str:
+    """Return the waste ID of a card, or "" when it is not recognized.
+
+    The title is matched ignoring case, whitespace and diacritics; a title
+    that still does not match falls back to the side color of the card.
+    """
+    waste_id = WASTE_TYPE_TO_ID.get(waste_type)
+    if waste_id is None:
+        waste_id = _WASTE_IDS_BY_NAME.get(waste_type_key(waste_type))
+    if waste_id is None:
+        waste_id = _WASTE_IDS_BY_COLOR.get(color.upper())
+        if waste_id is not None:
+            _LOGGER.debug("Unknown waste type %s recognized by color %s", waste_type, color)
+    return waste_id or ""
+
+
+def _make_entry(style_attr: str, date_text: str, waste_type: str) -> Optional[Collection]:
+    """Build a date entry from the raw texts of a single card."""
+    color_match = _COLOR_RE.search(style_attr)
+    color = color_match.group(1).strip() if color_match else ""
+
+    # Get date
+    date_match = _DATE_RE.search(date_text)
+    if not date_match:
+        return None
+    date_str = date_match.group(1)
+
+    # Get weekday
+    weekday_match = _WEEKDAY_RE.search(date_text)
+    weekday = weekday_match.group(1) if weekday_match else None
+
+    try:
+        date_obj = date.fromisoformat(date_str)
+    except ValueError as date_error:
+        _LOGGER.error("Invalid date format: %s - %s", date_str, date_error)
+        return None
+
+    return Collection.create(
+        date_obj, weekday, waste_type, resolve_waste_id(waste_type, color), color
+    )
+
+
+def parse_schedule_soup(html: str) -> Tuple[List[Collection], int]:
+    """Parse schedule page by building a full BeautifulSoup tree.
+
+    Returns the collections and the number of date cards found.
+    """
+    soup = _soup(html)
+    dates = []
+
+    # Parse each date card
+    cards = soup.find_all("div", class_="termin card")
+    for card in cards:
+        try:
+            # Get side color
+            side = card.find("div", class_="bok")
+            if not side or not side.get("style"):
+                continue
+
+            # Get date
+            date_header = card.find("div", class_="naglowek")
+            if not date_header:
+                continue
+
+            # Get waste type
+            content = card.find("div", class_="srodek")
+            if not content:
+                continue
+
+            title = content.find("h3")
+            if not title:
+                continue
+
+            entry = _make_entry(
+                side.get("style", ""), date_header.text.strip(), title.text.strip()
+            )
+            if entry:
+                dates.append(entry)
+        except Exception as e:
+            _LOGGER.error("Error processing date card: %s", e)
+
+    return dates, len(cards)
+
+
+class _ScheduleExtractor(HTMLParser):
+    """Single-pass extractor of date cards driven by parser events.
+
+    Only the handful of strings needed per card are kept; no tree is built.
+    """
+
+    def __init__(self):
+        """Initialize."""
+        super().__init__()
+        self.dates: List[Collection] = []
+        self.cards = 0
+        self._depth = 0
+        self._card_depth: Optional[int] = None
+        self._header_depth: Optional[int] = None
+        self._content_depth: Optional[int] = None
+        self._in_title = False
+        self._reset_card()
+
+    def _reset_card(self) -> None:
+        self._style: Optional[str] = None
+        self._header: Optional[List[str]] = None
+        self._title: Optional[List[str]] = None
+
+    def handle_starttag(self, tag, attrs):
+        if tag == "h3":
+            if self._content_depth is not None and self._title is None:
+                self._title = []
+                self._in_title = True
+            return
+        if tag != "div":
+            return
+
+        self._depth += 1
+        classes = ()
+        for name, value in attrs:
+            if name == "class" and value:
+                classes = value.split()
+                break
+
+        if self._card_depth is None:
+            if "termin" in classes and "card" in classes:
+                self.cards += 1
+                self._card_depth = self._depth
+                self._reset_card()
+            return
+
+        if "bok" in classes and self._style is None:
+            self._style = next((v for n, v in attrs if n == "style"), None) or ""
+        elif "naglowek" in classes and self._header is None:
+            self._header = []
+            self._header_depth = self._depth
+        elif "srodek" in classes and self._content_depth is None:
+            self._content_depth = self._depth
+
+    def handle_endtag(self, tag):
+        if tag == "h3":
+            self._in_title = False
+            return
+        if tag != "div" or self._depth == 0:
+            return
+
+        if self._header_depth == self._depth:
+            self._header_depth = None
+        if self._content_depth == self._depth:
+            self._content_depth = None
+            self._in_title = False
+        if self._card_depth == self._depth:
+            self._card_depth = None
+            self._finish_card()
+
+        self._depth -= 1
+
+    def handle_data(self, data):
+        if self._header_depth is not None:
+            self._header.append(data)
+        if self._in_title:
+            self._title.append(data)
+
+    def _finish_card(self) -> None:
+        # Same skip rules as the BeautifulSoup backend
+        if not self._style or self._header is None or self._title is None:
+            return
+        try:
+            entry = _make_entry(
+                self._style,
+                "".join(self._header).strip(),
+                "".join(self._title).strip(),
+            )
+        except Exception as e:
+            _LOGGER.error("Error processing date card: %s", e)
+            return
+        if entry:
+            self.dates.append(entry)
+
+
+def parse_schedule_streaming(html: str) -> Tuple[List[Collection], int]:
+    """Parse schedule page in a single pass without building a DOM.
+
+    Returns the collections and the number of date cards found.
+    """
+    extractor = _ScheduleExtractor()
+    extractor.feed(html)
+    extractor.close()
+    return extractor.dates, extractor.cards
+
+
+_BACKENDS = {
+    PARSER_STREAMING: parse_schedule_streaming,
+    PARSER_BEAUTIFULSOUP: parse_schedule_soup,
+}
+
+
+def parse_schedule(
+    html: str, parser: str = PARSER_STREAMING
+) -> Tuple[List[Collection], int]:
+    """Parse schedule page into a sorted list of collections.
+
+    Returns the collections and the number of date cards that could not be
+    turned into one. Falls back to BeautifulSoup when the selected backend
+    fails or finds nothing on a page that does contain date cards.
+    """
+    dates = None
+    if parser != PARSER_BEAUTIFULSOUP:
+        try:
+            dates, cards = _BACKENDS[parser](html)
+        except Exception as e:
+            _LOGGER.warning("Parser %s failed, falling back to BeautifulSoup: %s", parser, e)
+        if not dates and "termin card" in html:
+            dates = None
+
+    if dates is None:
+        dates, cards = parse_schedule_soup(html)
+
+    # Sort dates by date
+    dates.sort(key=lambda x: x.date_obj)
+
+    return dates, cards - len(dates)
+
+
+def parse_municipalities(html: str) -> List[Dict[str, Any]]:
+    """Parse the municipality list page."""
+    # Parse HTML
+    soup = _soup(html)
+    select_element = soup.find("select", id="selGmina")
+
+    if not select_element:
+        _LOGGER.error("Could not find select element with id='selGmina'")
+        return []
+
+    options = select_element.find_all("option")
+    municipalities = []
+
+    # Parse each option
+    for option in options:
+        value = option.get("value")
+        if not value:  # Skip empty or default option
+            continue
+
+        text = option.text.strip()
+        match = _MUNICIPALITY_RE.search(text)
+
+        if match:
+            province = match.group(1).strip()
+            district = match.group(2).strip()
+            municipality = match.group(3).strip()
+
+            municipalities.append(
+                {
+                    "id": value,
+                    "province": province,
+                    "district": district,
+                    "municipality": municipality,
+                    "full_name": text,
+                }
+            )
+
+    return municipalities
+
+
+def parse_streets(html: str) -> Dict[str, Any]:
+    """Parse the street list page of a municipality."""
+    # Parse HTML
+    soup = _soup(html)
+
+    # Get municipality name
+    try:
+        header = soup.find("h4")
+        if header:
+            header_text = header.text
+            match = _MUNICIPALITY_NAME_RE.search(header_text)
+            if match:
+                municipality_name = match.group(1).strip()
+            else:
+                municipality_name = "Unknown municipality"
+        else:
+            municipality_name = "Unknown municipality"
+    except (AttributeError, IndexError):
+        municipality_name = "Unknown municipality"
+        _LOGGER.warning("Could not find municipality name")
+
+    # Find the streets select element
+    select_element = soup.find("select", id="selUlica")
+
+    if not select_element:
+        _LOGGER.error("Could not find select element with id='selUlica'")
+        return {"streets": [], "municipality_name": municipality_name}
+
+    options = select_element.find_all("option")
+    streets = []
+
+    # Parse each option
+    for option in options:
+        # Skip the hidden default option
+        if (
+            option.has_attr("hidden")
+            or option.has_attr("disabled")
+            or option.has_attr("selected")
+        ):
+            continue
+
+        street_name = option.text.strip()
+        streets.append(street_name)
+
+    return {
+        "streets": streets,
+        "municipality_name": municipality_name,
+    }
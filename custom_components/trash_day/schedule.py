@@ -0,0 +1,163 @@
+"""Indexed waste collection schedule for TrashDay integration."""
+import sys
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass
+from datetime import date
+from typing import Dict, List, Optional, Tuple
+
+
+@dataclass(frozen=True, slots=True)
+class Collection:
+    """A single collection day of one waste type.
+
+    Instances are shared by the index, the coordinator data and all entities
+    of a street, so they are immutable. Repeated strings are interned.
+    """
+
+    date_obj: date
+    weekday: Optional[str]
+    waste_type: str
+    waste_id: str
+    color: str
+
+    @classmethod
+    def create(
+        cls,
+        date_obj: date,
+        weekday: Optional[str],
+        waste_type: str,
+        waste_id: str,
+        color: str,
+    ) -> "Collection":
+        """Return a collection with interned text fields."""
+        return cls(
+            date_obj,
+            sys.intern(weekday) if weekday else weekday,
+            sys.intern(waste_type),
+            sys.intern(waste_id),
+            sys.intern(color),
+        )
+
+    @property
+    def date(self) -> str:
+        """Return the date in ISO format."""
+        return self.date_obj.isoformat()
+
+
+class ScheduleIndex:
+    """Schedule entries grouped per waste type and sorted by date.
+
+    Grouping is done in a single pass over the parsed entries. Next-date
+    lookups are binary searches over per-type lists of date ordinals.
+    """
+
+    __slots__ = ("dates", "entries", "ordinals", "all_ordinals")
+
+    def __init__(self, dates: List[Collection]):
+        """Build the index from entries sorted by date."""
+        self.dates = dates
+        self.entries: Dict[str, List[Collection]] = {}
+        self.ordinals: Dict[str, List[int]] = {}
+        self.all_ordinals: List[int] = []
+
+        for entry in dates:
+            self.all_ordinals.append(entry.date_obj.toordinal())
+            waste_id = entry.waste_id
+            entries = self.entries.get(waste_id)
+            if entries is None:
+                entries = self.entries[waste_id] = []
+                self.ordinals[waste_id] = []
+            entries.append(entry)
+            self.ordinals[waste_id].append(self.all_ordinals[-1])
+
+    def entries_for(self, waste_id: str) -> List[Collection]:
+        """Return all entries of a waste type."""
+        return self.entries.get(waste_id, [])
+
+    def next_on_or_after(self, waste_id: str, day: date) -> Optional[Collection]:
+        """Return the first entry of a waste type on or after the given day."""
+        ordinals = self.ordinals.get(waste_id)
+        if not ordinals:
+            return None
+        pos = bisect_left(ordinals, day.toordinal())
+        if pos == len(ordinals):
+            return None
+        return self.entries[waste_id][pos]
+
+    def upcoming(
+        self,
+        waste_id: str,
+        day: date,
+        limit: Optional[int] = None,
+        until: Optional[date] = None,
+    ) -> List[Collection]:
+        """Return entries of a waste type from the given day on.
+
+        The result is cut to at most ``limit`` entries and to dates up to and
+        including ``until`` when those are given.
+        """
+        ordinals = self.ordinals.get(waste_id)
+        if not ordinals:
+            return []
+        start = bisect_left(ordinals, day.toordinal())
+        end = len(ordinals)
+        if until is not None:
+            end = bisect_right(ordinals, until.toordinal())
+        if limit is not None:
+            end = min(end, start + limit)
+        return self.entries[waste_id][start:end]
+
+    def next_per_type(self, day: date, waste_ids=None) -> List[Collection]:
+        """Return the next entry of every waste type, soonest first."""
+        upcoming = []
+        for waste_id in waste_ids if waste_ids is not None else self.entries:
+            entry = self.next_on_or_after(waste_id, day)
+            if entry:
+                upcoming.append(entry)
+        upcoming.sort(key=lambda e: e.date_obj)
+        return upcoming
+
+    def span(self, start: date, end: date) -> slice:
+        """Return the slice of ``dates`` falling in [start, end)."""
+        return slice(
+            bisect_left(self.all_ordinals, start.toordinal()),
+            bisect_left(self.all_ordinals, end.toordinal()),
+        )
+
+
+def merge_timeline(
+    timeline: List[Collection], fetched: List[Collection], keep_since: date
+) -> Tuple[List[Collection], List[Collection], List[Collection]]:
+    """Merge a fetched schedule into a street's timeline.
+
+    The fetched page is authoritative from its first collection onward, so
+    dates the operator dropped from the end of the schedule are removed too;
+    collections there are deduplicated by date and waste type. Collections
+    before the page are kept, so past years stay available after the page
+    moves on, except those before ``keep_since``. Returns the merged
+    timeline and the collections added and removed.
+    """
+    if not fetched:
+        # An empty page is more likely broken than a cleared schedule
+        return timeline, [], []
+
+    first = fetched[0].date_obj
+
+    kept = []
+    previous = {}
+    for collection in timeline:
+        if collection.date_obj >= first:
+            previous[(collection.date_obj, collection.waste_id)] = collection
+        elif collection.date_obj >= keep_since:
+            kept.append(collection)
+
+    current = {}
+    for collection in fetched:
+        current.setdefault((collection.date_obj, collection.waste_id), collection)
+
+    added = [c for key, c in current.items() if key not in previous]
+    removed = [c for key, c in previous.items() if key not in current]
+
+    merged = kept + list(current.values())
+    merged.sort(key=lambda c: c.date_obj)
+    return merged, added, removed
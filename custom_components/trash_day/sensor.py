@@ -1,178 +1,293 @@
 """Sensor platform for TrashDay integration."""
 import logging
-from datetime import datetime, date
-from typing import Any, Dict, List, Optional, Union
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import Any, Callable, Dict, List, Optional
 
 from homeassistant.components.sensor import (
     SensorEntity,
+    SensorEntityDescription,
     SensorDeviceClass,
+    SensorStateClass,
 )
 from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import (
+    PERCENTAGE,
+    EntityCategory,
+    UnitOfInformation,
+    UnitOfTime,
+)
 from homeassistant.core import HomeAssistant, callback
-from homeassistant.helpers.entity import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .const import (
     DOMAIN,
-    CONF_MUNICIPALITY_ID,
-    CONF_MUNICIPALITY_NAME,
-    CONF_STREET,
-    ATTR_NEXT_COLLECTION,
+    CONF_MAX_COLLECTIONS,
+    CONF_COLLECTIONS_WINDOW,
+    DEFAULT_MAX_COLLECTIONS,
+    DEFAULT_COLLECTIONS_WINDOW,
     ATTR_WASTE_TYPE,
     ATTR_DAYS_UNTIL,
     ATTR_COLLECTIONS,
     ATTR_ALL_COLLECTIONS,
-    ATTR_SCHEDULE,
-    WASTE_TYPES,
+    DAYS_TEXT_TODAY,
+    DAYS_TEXT_TOMORROW,
+    DAYS_TEXT_IN_DAYS,
+    DAYS_TEXT_UNKNOWN,
 )
-from .coordinator import WasteCollectionCoordinator
+from .coordinator import FetchMetrics, WasteCollectionCoordinator
+from .entity import WasteCollectionEntity
+from .schedule import Collection
 
 _LOGGER = logging.getLogger(__name__)
 
 
+def _ms(seconds: Optional[float]) -> Optional[float]:
+    """Convert seconds to rounded milliseconds."""
+    return None if seconds is None else round(seconds * 1000, 1)
+
+
+@dataclass(frozen=True, kw_only=True)
+class FetchMetricDescription(SensorEntityDescription):
+    """Describes a diagnostic sensor of schedule fetch statistics."""
+
+    value_fn: Callable[[FetchMetrics], Any]
+    # Most values change on every fetch, keep them out of the recorder
+    # unless enabled for troubleshooting
+    entity_registry_enabled_default: bool = False
+
+
+FETCH_METRICS = (
+    FetchMetricDescription(
+        key="fetch_latency",
+        name="Fetch Latency",
+        icon="mdi:timer-outline",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda m: _ms(m.last_fetch_time),
+    ),
+    FetchMetricDescription(
+        key="html_size",
+        name="Schedule Page Size",
+        icon="mdi:file-code-outline",
+        device_class=SensorDeviceClass.DATA_SIZE,
+        native_unit_of_measurement=UnitOfInformation.BYTES,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda m: m.last_html_size,
+    ),
+    FetchMetricDescription(
+        key="parse_time",
+        name="Parse Time",
+        icon="mdi:timer-cog-outline",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda m: _ms(m.last_parse_time),
+    ),
+    FetchMetricDescription(
+        key="cards_parsed",
+        name="Cards Parsed",
+        icon="mdi:cards-outline",
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda m: m.cards_parsed,
+    ),
+    FetchMetricDescription(
+        key="cards_skipped",
+        name="Cards Skipped",
+        icon="mdi:cards-playing-outline",
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda m: m.cards_skipped,
+    ),
+    FetchMetricDescription(
+        key="fetch_failures",
+        name="Fetch Failures",
+        icon="mdi:alert-circle-outline",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda m: m.failures,
+    ),
+    FetchMetricDescription(
+        key="cache_hit_ratio",
+        name="Cache Hit Ratio",
+        icon="mdi:cached",
+        native_unit_of_measurement=PERCENTAGE,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda m: None
+        if m.cache_hit_ratio is None
+        else round(m.cache_hit_ratio * 100, 1),
+    ),
+)
+
+
+def _waste_type_sensors(
+    coordinator: WasteCollectionCoordinator,
+    entry: ConfigEntry,
+    street: str,
+    waste_ids: List[str],
+) -> List[SensorEntity]:
+    """Return the date and days text sensors of waste types on a street."""
+    entities = []
+    for waste_id in waste_ids:
+        waste_info = coordinator.waste_type_info(waste_id)
+        entities.append(
+            WasteTypeSensor(
+                coordinator,
+                entry,
+                street,
+                waste_id,
+                waste_info["name"],
+                waste_info["icon"],
+                waste_info["color"]
+            )
+        )
+        # Human readable "days until" text
+        entities.append(
+            DaysTextSensor(coordinator, entry, street, waste_id, waste_info["name"])
+        )
+    return entities
+
+
 async def async_setup_entry(
     hass: HomeAssistant, entry: ConfigEntry, async_add_entities: AddEntitiesCallback
 ) -> None:
     """Set up the waste collection sensor."""
     coordinator = hass.data[DOMAIN][entry.entry_id]
+    waste_ids = coordinator.hub.registry.waste_ids()
 
     # Create entities
     entities = []
 
-    # Create main sensor (next collection)
-    entities.append(NextWasteCollectionSensor(coordinator, entry))
-
-    # Create waste type specific sensors
-    for waste_id, waste_info in WASTE_TYPES.items():
-        if waste_id in coordinator.data.get("waste_types", {}):
-            entities.append(
-                WasteTypeSensor(
-                    coordinator,
-                    entry,
-                    waste_id,
-                    waste_info["name"],
-                    waste_info["icon"],
-                    waste_info["color"]
-                )
-            )
-
-    async_add_entities(entities)
+    for street in coordinator.streets:
+        # Create main sensors (next collection)
+        entities.append(NextWasteCollectionSensor(coordinator, entry, street))
+        entities.append(DaysTextSensor(coordinator, entry, street))
 
+        # Create waste type specific sensors
+        entities.extend(_waste_type_sensors(coordinator, entry, street, waste_ids))
 
-class WasteCollectionSensorBase(CoordinatorEntity):
-    """Base class for waste collection sensors."""
+        # Fetch statistics of the street
+        entities.extend(
+            FetchMetricSensor(coordinator, entry, street, description)
+            for description in FETCH_METRICS
+        )
 
-    def __init__(self, coordinator: WasteCollectionCoordinator, config_entry: ConfigEntry):
-        """Initialize the sensor."""
-        super().__init__(coordinator)
-        self.config_entry = config_entry
-        self.municipality_id = config_entry.data[CONF_MUNICIPALITY_ID]
-        self.municipality_name = config_entry.data.get(CONF_MUNICIPALITY_NAME, "Unknown")
-        self.street = config_entry.data[CONF_STREET]
+    async_add_entities(entities)
 
-    @property
-    def device_info(self) -> DeviceInfo:
-        """Return device info."""
-        return DeviceInfo(
-            identifiers={(DOMAIN, self.municipality_id)},
-            name=f"Waste Collection - {self.municipality_name}",
-            manufacturer="kiedysmieci.info",
-            model="Waste Collection Schedule",
-            sw_version="0.1.0",
+    known_ids = set(waste_ids)
+
+    @callback
+    def _async_add_learned_types() -> None:
+        """Add sensors for waste types that first appeared after setup."""
+        new_ids = [
+            waste_id
+            for waste_id in coordinator.hub.registry.waste_ids()
+            if waste_id not in known_ids
+        ]
+        if not new_ids:
+            return
+        known_ids.update(new_ids)
+        async_add_entities(
+            [
+                entity
+                for street in coordinator.streets
+                for entity in _waste_type_sensors(coordinator, entry, street, new_ids)
+            ]
         )
 
+    entry.async_on_unload(coordinator.async_add_listener(_async_add_learned_types))
+
 
-class NextWasteCollectionSensor(WasteCollectionSensorBase, SensorEntity):
+class NextWasteCollectionSensor(WasteCollectionEntity, SensorEntity):
     """Sensor for the next waste collection."""
 
     _attr_device_class = SensorDeviceClass.DATE
+    # Upcoming collections are available via the get_schedule service
+    _unrecorded_attributes = frozenset({ATTR_COLLECTIONS})
 
-    def __init__(self, coordinator: WasteCollectionCoordinator, config_entry: ConfigEntry):
+    def __init__(
+        self,
+        coordinator: WasteCollectionCoordinator,
+        config_entry: ConfigEntry,
+        street: str,
+    ):
         """Initialize the sensor."""
-        super().__init__(coordinator, config_entry)
+        super().__init__(coordinator, config_entry, street)
         self._attr_name = f"Next Waste Collection {self.street}"
         self._attr_unique_id = f"{self.municipality_id}_{self.street}_next_collection"
         self._attr_icon = "mdi:trash-can-outline"
 
+    def _data_key(self):
+        """Depend only on the next collection of each waste type."""
+        return tuple(self._upcoming())
+
+    def _upcoming(self) -> List[Collection]:
+        """Return the next collection of every waste type, soonest first."""
+        data = self._street_data
+        if not data:
+            return []
+        return data["next_collections"]
+
     @property
     def native_value(self) -> Optional[date]:
         """Return the next collection date."""
-        if (self.coordinator.data and
-            self.coordinator.data.get("next_collection") and
-            self.coordinator.data["next_collection"].get("date_obj")):
+        upcoming = self._upcoming()
+        if upcoming:
             # Zwracamy obiekt date zamiast stringa
-            return self.coordinator.data["next_collection"]["date_obj"]
+            return upcoming[0].date_obj
         return None
 
-    @property
-    def extra_state_attributes(self) -> Dict[str, Any]:
-        """Return additional attributes."""
+    def _build_attributes(self) -> Dict[str, Any]:
+        """Build additional attributes."""
         attrs = {}
+        upcoming = self._upcoming()
+        today = self._today
 
-        if (self.coordinator.data and
-            self.coordinator.data.get("next_collection")):
-            next_collection = self.coordinator.data["next_collection"]
+        if upcoming:
+            next_collection = upcoming[0]
+            waste_info = self.coordinator.waste_type_info(next_collection.waste_id)
 
             # Sprawdź, czy dziś jest dzień wywozu śmieci
-            today = date.today()
-            next_date = next_collection.get("date_obj")
-
-            if next_date:
-                days_until = (next_date - today).days
-                attrs[ATTR_DAYS_UNTIL] = days_until
-            else:
-                attrs[ATTR_DAYS_UNTIL] = None
-
-            attrs[ATTR_WASTE_TYPE] = next_collection.get("waste_type", "")
-            attrs["weekday"] = next_collection.get("weekday", "")
-            attrs["waste_id"] = next_collection.get("waste_id", "")
-            attrs["icon"] = next_collection.get("icon", "")
-            attrs["color"] = next_collection.get("color", "")
-
-        # Add upcoming collections for each type
-        if (self.coordinator.data and
-            self.coordinator.data.get("next_collections")):
-
-            today = date.today()
-            collections_with_days = []
-
-            for c in self.coordinator.data["next_collections"][:5]:  # Show next 5 collections
-                collection_date = c.get("date_obj")
-                if collection_date:
-                    days_until = (collection_date - today).days
-                else:
-                    days_until = None
-
-                collections_with_days.append({
-                    "date": c.get("date", ""),
-                    "waste_type": c.get("waste_type", ""),
-                    "waste_id": c.get("waste_id", ""),
-                    "days_until": days_until,
-                    "weekday": c.get("weekday", "")
-                })
-
-            attrs[ATTR_COLLECTIONS] = collections_with_days
+            attrs[ATTR_DAYS_UNTIL] = (next_collection.date_obj - today).days
+            attrs[ATTR_WASTE_TYPE] = waste_info["name_pl"]
+            attrs["weekday"] = next_collection.weekday
+            attrs["waste_id"] = next_collection.waste_id
+            attrs["icon"] = waste_info["icon"]
+            attrs["color"] = waste_info["color"]
+
+            # Add upcoming collections for each type
+            attrs[ATTR_COLLECTIONS] = [
+                {
+                    "date": c.date,
+                    "waste_type": self.coordinator.waste_type_info(c.waste_id)["name_pl"],
+                    "waste_id": c.waste_id,
+                    "days_until": (c.date_obj - today).days,
+                    "weekday": c.weekday,
+                }
+                for c in upcoming[:5]  # Show next 5 collections
+            ]
 
         return attrs
 
 
-class WasteTypeSensor(WasteCollectionSensorBase, SensorEntity):
+class WasteTypeSensor(WasteCollectionEntity, SensorEntity):
     """Sensor for specific waste type collection."""
 
     _attr_device_class = SensorDeviceClass.DATE
+    # The full schedule is available via the get_schedule service
+    _unrecorded_attributes = frozenset({ATTR_ALL_COLLECTIONS})
 
     def __init__(
         self,
         coordinator: WasteCollectionCoordinator,
         config_entry: ConfigEntry,
+        street: str,
         waste_id: str,
         waste_name: str,
         icon: str,
         color: str
     ):
         """Initialize the sensor."""
-        super().__init__(coordinator, config_entry)
+        super().__init__(coordinator, config_entry, street)
         self.waste_id = waste_id
         self.waste_name = waste_name
         self._attr_name = f"{self.waste_name} Collection {self.street}"
@@ -180,88 +295,68 @@ class WasteTypeSensor(WasteCollectionSensorBase, SensorEntity):
         self._attr_icon = icon
         self.color = color
 
+    def _data_key(self):
+        """Depend only on the dates of this waste type."""
+        data = self._street_data
+        return data["type_versions"].get(self.waste_id, 0) if data else None
+
     @property
     def available(self) -> bool:
         """Return if entity is available."""
-        if not self.coordinator.last_update_success:
+        if not super().available:
             return False
 
-        return (
-            self.coordinator.data is not None
-            and self.waste_id in self.coordinator.data.get("waste_types", {})
-        )
+        return self.waste_id in self._street_data.get("waste_types", {})
 
     @property
     def native_value(self) -> Optional[date]:
         """Return the next collection date for this waste type."""
-        try:
-            if (self.coordinator.data and
-                self.waste_id in self.coordinator.data.get("waste_types", {}) and
-                self.coordinator.data["waste_types"][self.waste_id].get("next_collection_date_obj")):
-                return self.coordinator.data["waste_types"][self.waste_id]["next_collection_date_obj"]
-            elif (self.coordinator.data and
-                  self.waste_id in self.coordinator.data.get("waste_types", {}) and
-                  self.coordinator.data["waste_types"][self.waste_id].get("next_collection")):
-                # Konwertujemy string daty na obiekt date
-                date_str = self.coordinator.data["waste_types"][self.waste_id]["next_collection"]
-                return datetime.strptime(date_str, "%Y-%m-%d").date()
-            return None
-        except (ValueError, KeyError, TypeError) as e:
-            _LOGGER.error("Error getting date for %s: %s", self.waste_id, e)
+        data = self._street_data
+        if not data:
             return None
+        next_collection = data["waste_types"].get(self.waste_id)
+        return next_collection.date_obj if next_collection else None
 
-    @property
-    def extra_state_attributes(self) -> Dict[str, Any]:
-        """Return additional attributes."""
+    def _build_attributes(self) -> Dict[str, Any]:
+        """Build additional attributes."""
         attrs = {}
+        index = self._index
 
         try:
-            if (self.coordinator.data and
-                self.waste_id in self.coordinator.data.get("waste_types", {})):
-                waste_data = self.coordinator.data["waste_types"][self.waste_id]
-
-                if waste_data.get("next_collection"):
-                    # Recalculate days_until to make sure it's up to date
-                    today = date.today()
-                    next_date = waste_data.get("next_collection_date_obj")
-
-                    if next_date:
-                        days_until = (next_date - today).days
-                        attrs[ATTR_DAYS_UNTIL] = days_until
-                    else:
-                        date_str = waste_data.get("next_collection")
-                        if date_str:
-                            try:
-                                next_date = datetime.strptime(date_str, "%Y-%m-%d").date()
-                                days_until = (next_date - today).days
-                                attrs[ATTR_DAYS_UNTIL] = days_until
-                            except ValueError:
-                                attrs[ATTR_DAYS_UNTIL] = waste_data.get("days_until")
-                        else:
-                            attrs[ATTR_DAYS_UNTIL] = waste_data.get("days_until")
-
-                    attrs["weekday"] = waste_data.get("next_collection_weekday", "")
-
-                # Add all future collection dates for this type
-                if waste_data.get("dates"):
-                    # Recalculate days_until for each date
-                    today = date.today()
-                    dates_with_days = []
-
-                    for d in waste_data["dates"]:
-                        date_obj = d.get("date_obj")
-                        if date_obj:
-                            days_until = (date_obj - today).days
-                        else:
-                            days_until = None
-
-                        dates_with_days.append({
-                            "date": d.get("date", ""),
-                            "weekday": d.get("weekday", ""),
-                            "days_until": days_until
-                        })
-
-                    attrs[ATTR_ALL_COLLECTIONS] = dates_with_days
+            if index is not None and self.waste_id in self._street_data.get("waste_types", {}):
+                today = self._today
+                next_collection = self._street_data["waste_types"][self.waste_id]
+
+                if next_collection:
+                    attrs[ATTR_DAYS_UNTIL] = (next_collection.date_obj - today).days
+                    attrs["weekday"] = next_collection.weekday
+
+                # Add collection dates for this type, optionally capped
+                max_collections = self.config_entry.options.get(
+                    CONF_MAX_COLLECTIONS, DEFAULT_MAX_COLLECTIONS
+                )
+                window = self.config_entry.options.get(
+                    CONF_COLLECTIONS_WINDOW, DEFAULT_COLLECTIONS_WINDOW
+                )
+                if max_collections or window:
+                    entries = index.upcoming(
+                        self.waste_id,
+                        today,
+                        limit=max_collections or None,
+                        until=today + timedelta(days=window) if window else None,
+                    )
+                else:
+                    # The timeline keeps past years, show this year onwards
+                    entries = index.upcoming(self.waste_id, today.replace(month=1, day=1))
+                if entries:
+                    attrs[ATTR_ALL_COLLECTIONS] = [
+                        {
+                            "date": d.date,
+                            "weekday": d.weekday,
+                            "days_until": (d.date_obj - today).days,
+                        }
+                        for d in entries
+                    ]
 
                 attrs["icon"] = self._attr_icon
                 attrs["color"] = self.color
@@ -269,4 +364,110 @@ class WasteTypeSensor(WasteCollectionSensorBase, SensorEntity):
         except Exception as e:
             _LOGGER.error("Error setting attributes for %s: %s", self.waste_id, e)
 
-        return attrs
\ No newline at end of file
+        return attrs
+
+
+def days_text(days: Optional[int]) -> str:
+    """Return a Polish description of the days left until a collection."""
+    if days is None:
+        return DAYS_TEXT_UNKNOWN
+    if days == 0:
+        return DAYS_TEXT_TODAY
+    if days == 1:
+        return DAYS_TEXT_TOMORROW
+    return DAYS_TEXT_IN_DAYS.format(days=days)
+
+
+class DaysTextSensor(WasteCollectionEntity, SensorEntity):
+    """Text telling how soon the next collection is (Dzisiaj!, Jutro!, Za N dni).
+
+    Replaces the template sensors written by install_template_sensors. The
+    state follows the coordinator data, so it changes only on day rollover or
+    when the next collection changes.
+    """
+
+    _attr_icon = "mdi:calendar-text"
+
+    def __init__(
+        self,
+        coordinator: WasteCollectionCoordinator,
+        config_entry: ConfigEntry,
+        street: str,
+        waste_id: Optional[str] = None,
+        waste_name: Optional[str] = None,
+    ):
+        """Initialize the sensor; without a waste type it follows any collection."""
+        super().__init__(coordinator, config_entry, street)
+        self.waste_id = waste_id
+        if waste_id is None:
+            self._attr_name = f"Next Waste Collection Text {self.street}"
+            self._attr_unique_id = f"{self.municipality_id}_{self.street}_next_days_text"
+        else:
+            self._attr_name = f"{waste_name} Collection Text {self.street}"
+            self._attr_unique_id = f"{self.municipality_id}_{self.street}_{waste_id}_days_text"
+
+    @property
+    def available(self) -> bool:
+        """Return True, a missing schedule is reported as Brak danych."""
+        return True
+
+    def _next_collection(self) -> Optional[Collection]:
+        data = self._street_data
+        if not data:
+            return None
+        if self.waste_id is None:
+            return data["next_collection"]
+        return data["waste_types"].get(self.waste_id)
+
+    def _days_until(self) -> Optional[int]:
+        next_collection = self._next_collection()
+        if next_collection is None:
+            return None
+        return (next_collection.date_obj - self._today).days
+
+    def _data_key(self):
+        """Depend only on the next collection."""
+        return self._next_collection()
+
+    @property
+    def native_value(self) -> str:
+        """Return the days text."""
+        return days_text(self._days_until())
+
+    def _build_attributes(self) -> Dict[str, Any]:
+        """Build additional attributes."""
+        return {ATTR_DAYS_UNTIL: self._days_until()}
+
+
+class FetchMetricSensor(WasteCollectionEntity, SensorEntity):
+    """Diagnostic sensor with a statistic of the street's schedule fetches."""
+
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    entity_description: FetchMetricDescription
+
+    def __init__(
+        self,
+        coordinator: WasteCollectionCoordinator,
+        config_entry: ConfigEntry,
+        street: str,
+        description: FetchMetricDescription,
+    ):
+        """Initialize the sensor."""
+        super().__init__(coordinator, config_entry, street)
+        self.entity_description = description
+        self._attr_name = f"{description.name} {self.street}"
+        self._attr_unique_id = f"{self.municipality_id}_{self.street}_{description.key}"
+
+    @property
+    def available(self) -> bool:
+        """Return True, statistics are kept also while fetching fails."""
+        return True
+
+    def _data_key(self):
+        """Depend only on the statistic itself."""
+        return self.native_value
+
+    @property
+    def native_value(self) -> Any:
+        """Return the statistic."""
+        return self.entity_description.value_fn(self.coordinator.metrics[self.street])
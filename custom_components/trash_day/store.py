@@ -0,0 +1,99 @@
+"""Persistent schedule cache for TrashDay integration."""
+import logging
+from datetime import date
+from typing import Any, Dict, List, Optional
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+from homeassistant.util import slugify
+
+from .const import DOMAIN, STORAGE_VERSION
+from .schedule import Collection
+
+_LOGGER = logging.getLogger(__name__)
+
+# Order of fields in a stored schedule row
+_ROW_FIELDS = ("date", "weekday", "waste_type", "waste_id", "color")
+
+
+def _encode_dates(dates: List[Collection]) -> List[List[Any]]:
+    """Pack collections into compact rows."""
+    return [[getattr(d, field) for field in _ROW_FIELDS] for d in dates]
+
+
+def _decode_dates(rows: List[List[Any]]) -> List[Collection]:
+    """Unpack compact rows into collections."""
+    dates = []
+    for row in rows:
+        try:
+            day, weekday, waste_type, waste_id, color = row
+            dates.append(
+                Collection.create(
+                    date.fromisoformat(day), weekday, waste_type or "", waste_id or "", color or ""
+                )
+            )
+        except (TypeError, ValueError):
+            continue
+    return dates
+
+
+class ScheduleStore:
+    """Schedule timeline of a single street, kept on disk.
+
+    The timeline merges every fetched schedule (see merge_timeline), so it
+    also holds dates that are no longer published. A short log of what each
+    merge added and removed is kept with it.
+    """
+
+    def __init__(self, hass: HomeAssistant, municipality_id: str, street: str):
+        """Initialize."""
+        self._store = Store(
+            hass,
+            STORAGE_VERSION,
+            f"{DOMAIN}.schedule_{municipality_id}_{slugify(street)}",
+        )
+
+    async def async_load(self) -> Optional[Dict[str, Any]]:
+        """Return the cached schedule and its HTTP validators, if any."""
+        try:
+            stored = await self._store.async_load()
+        except Exception as e:
+            _LOGGER.warning("Could not load cached schedule: %s", e)
+            return None
+
+        if not stored or "schedule" not in stored:
+            return None
+
+        return {
+            "dates": _decode_dates(stored["schedule"]),
+            "etag": stored.get("etag"),
+            "last_modified": stored.get("last_modified"),
+            "content_hash": stored.get("content_hash"),
+            "retrieval_date": stored.get("retrieval_date"),
+            "changes": stored.get("changes", []),
+        }
+
+    async def async_save(
+        self,
+        dates: List[Collection],
+        etag: Optional[str],
+        last_modified: Optional[str],
+        content_hash: Optional[str],
+        retrieval_date: str,
+        changes: List[Dict[str, Any]],
+    ) -> None:
+        """Persist a timeline together with its HTTP validators and change log."""
+        await self._store.async_save(
+            {
+                "etag": etag,
+                "last_modified": last_modified,
+                "content_hash": content_hash,
+                "retrieval_date": retrieval_date,
+                "schedule": _encode_dates(dates),
+                "changes": changes,
+            }
+        )
+
+    async def async_remove(self) -> None:
+        """Remove the cached schedule."""
+        await self._store.async_remove()